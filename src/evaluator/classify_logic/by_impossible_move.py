@@ -1,6 +1,6 @@
-from collections import defaultdict
 from typing import Dict
-from utils.calculate_function import calculate_min_travel_time
+import numpy as np
+from utils.calculate_function import calculate_min_travel_time_matrix
 from domain.detector import Detector
 from domain.analysis_results import (
     PayloadRecordsCollection,
@@ -17,9 +17,16 @@ def classify_records_by_impossible_move(
     Hashed_Payloadごとのレコードを分析し、ありえない移動があった場合に新しいクラスタIDを割り当てる。
     戻り値: キーがクラスタID、値が推定ルート文字列の辞書
     例: {"payload1_cluster1": "ABCD", "payload1_cluster2": "ACD", "payload2_cluster1": "BCD"}
+
+    直前のレコードとの時間差・最小移動時間の比較はペイロードごとに配列でまとめて行い、
+    ありえない移動の位置でクラスタを区切る。
     """
     estimated_clustered_routes: Dict[str, str] = {}
-    cluster_counter = defaultdict(int)  # Payloadごとにクラスタ番号を管理
+
+    # 検出器ペアごとの最小移動時間は一度だけ計算
+    detector_index, min_travel_times = calculate_min_travel_time_matrix(
+        detectors, walker_speed
+    )
 
     for (
         payload_id,
@@ -29,84 +36,56 @@ def classify_records_by_impossible_move(
         if not records:
             continue
 
-        current_route_sequence_list: list[str] = []
-
-        cluster_counter[payload_id] += 1
-        # クラスタIDの生成、例: "payload1_cluster1"
-        current_cluster_id = f"{payload_id}_cluster{cluster_counter[payload_id]}"
-        # 最初のレコードの検出器名をsequenceに追加
-        records[0].is_judged = True  # is_judgedをTrueに設定
-        current_route_sequence_list.append(records[0].detector_id)
-
-        prev_record = records[0]
-        prev_record.is_judged = True  # 最初のprev_recordも判定に使用されるためTrueに
-
-        # 一個前のレコードと現在のレコードの比較を最終レコードまでループ
-        for i in range(1, len(records)):
-            current_record = records[i]
-            current_record.is_judged = True  # 判定に使用されるレコードをTrueに
-
-            prev_record_detector_id = prev_record.detector_id
-            current_record_detector_id = current_record.detector_id
-
-            if current_record_detector_id == current_route_sequence_list[-1]:
-                # シーケンスの最後のレコードと同じ検出器ならスキップ
-                # これは移動していないことを意味する
-                prev_record = current_record
+        detector_ids = [record.detector_id for record in records]
+        det_idx = np.array([detector_index[d_id] for d_id in detector_ids])
+        timestamps = np.array(
+            [record.timestamp for record in records], dtype="datetime64[us]"
+        )
+
+        # 一個前のレコードとの時間差（秒）と検出器間の最小移動時間
+        time_diffs = np.diff(timestamps).astype(np.int64) / 1_000_000
+        pair_min_travel_times = min_travel_times[det_idx[:-1], det_idx[1:]]
+
+        # 直前と同じ検出器のレコードは移動していないため判定の対象外
+        moved = det_idx[1:] != det_idx[:-1]
+        # 最小移動時間の80%未満で到達している場合はありえない移動と判断し、新しいクラスタを開始
+        impossible = moved & (time_diffs < pair_min_travel_times * 0.8)
+        break_positions = np.nonzero(impossible)[0] + 1
+
+        # 不可能移動レコード以外はすべて判定に使用される
+        for record in records:
+            record.is_judged = True
+        for pos in break_positions.tolist():
+            records[pos].is_judged = False  # 不可能移動レコードは判定に使用しない
+
+        # ルートに追加されるのは、直前と異なる検出器のレコード（先頭を含む）
+        route_positions = np.nonzero(np.concatenate(([True], moved)))[0]
+        # 不可能移動の位置でルートを分割し、クラスタごとのルート文字列を生成
+        route_segments = np.split(
+            route_positions, np.searchsorted(route_positions, break_positions)
+        )
+        route_strs = [
+            "".join(detector_ids[pos] for pos in segment.tolist())
+            for segment in route_segments
+        ]
+
+        for cluster_no, route_str in enumerate(route_strs, start=1):
+            # クラスタIDの生成、例: "payload1_cluster1"
+            cluster_id = f"{payload_id}_cluster{cluster_no}"
+            # 現在のクラスタIDのルートをペイロード名+クラスタ番号をキーにして保存
+            if len(route_str) > 1:
+                estimated_clustered_routes[cluster_id] = route_str
+
+            if cluster_no > len(break_positions):
                 continue
 
-            # ここで、前のレコードと現在のレコードの時間差を計算
-            time_diff = (
-                current_record.timestamp - prev_record.timestamp
-            ).total_seconds()
-
-            det1_obj = detectors[prev_record_detector_id]
-            det2_obj = detectors[current_record_detector_id]
-
-            # 前のレコードと現在のレコードの検出器間の最小移動時間を計算
-            min_travel_time = calculate_min_travel_time(
-                det1_obj, det2_obj, walker_speed
-            )
-
-            # 最小移動時間の80%未満で到達している場合はありえない移動と判断し、新しいクラスタを開始
-            if time_diff < min_travel_time * 0.8:
-                current_record.is_judged = False  # 不可能移動レコードは判定に使用しない
-                # 現在のクラスタIDのルートをペイロード名+クラスタ番号をキーにして保存
-                if len(current_route_sequence_list) > 1:
-                    estimated_clustered_routes[current_cluster_id] = "".join(
-                        current_route_sequence_list
-                    )
-
-                # ログを出力（デバッグ用）
-                print(
-                    f"Impossible move detected for payload {payload_id} between detectors {prev_record_detector_id} and {current_record_detector_id}. Time diff: {time_diff:.2f}s, Min travel time: {min_travel_time:.2f}s"
-                )
-                # 推定されたルートを出力
-                print(
-                    f"クラスタID {current_cluster_id}:推定ルート {''.join(current_route_sequence_list)}"
-                )
-
-                # 新しいクラスタを作成するため、クラスタ番号をインクリメント
-                cluster_counter[payload_id] += 1
-                # 新しいクラスタIDを生成
-                current_cluster_id = (
-                    f"{payload_id}_cluster{cluster_counter[payload_id]}"
-                )
-                # 新しいクラスタのルートシーケンスを初期化し、現在のレコードの検出器名を最初に追加
-                current_route_sequence_list = [current_record_detector_id]
-                prev_record = current_record
-                continue
-
-            # 正常な移動と判断された場合は、現在のレコードの検出器名（AやB）をシーケンスに追加
-            current_route_sequence_list.append(current_record_detector_id)
-
-            prev_record = current_record
-
-        #
-        if len(current_route_sequence_list) > 1:
-            estimated_clustered_routes[current_cluster_id] = "".join(
-                current_route_sequence_list
+            # ログを出力（デバッグ用）
+            pos = int(break_positions[cluster_no - 1])
+            print(
+                f"Impossible move detected for payload {payload_id} between detectors {detector_ids[pos - 1]} and {detector_ids[pos]}. Time diff: {time_diffs[pos - 1]:.2f}s, Min travel time: {pair_min_travel_times[pos - 1]:.2f}s"
             )
+            # 推定されたルートを出力
+            print(f"クラスタID {cluster_id}:推定ルート {route_str}")
 
     return (
         ClusteredRoutes(routes_by_cluster_id=estimated_clustered_routes),
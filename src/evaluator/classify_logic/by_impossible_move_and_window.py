@@ -1,6 +1,6 @@
-from collections import defaultdict
 from typing import Dict, List, Optional
-from utils.calculate_function import calculate_min_travel_time
+import numpy as np
+from utils.calculate_function import calculate_min_travel_time_matrix
 from domain.detector import Detector
 from domain.analysis_results import (
     PayloadRecordsCollection,
@@ -8,6 +8,84 @@ from domain.analysis_results import (
 )
 
 
+def _sweep_with_lookahead(
+    times_us: List[int],
+    det_idx: List[int],
+    min_travel_times: List[List[float]],
+    max_lookahead: int,
+    impossible_factor: float,
+) -> tuple[List[Optional[bool]], List[tuple[int, bool]]]:
+    """
+    1ペイロード分のレコード列を走査し、判定結果とルートに追加されるレコード位置を返す。
+    datetime やオブジェクトを使わず整数・浮動小数点のリストだけで完結させている。
+
+    引数:
+    - times_us: 各レコードのタイムスタンプ（マイクロ秒）
+    - det_idx: 各レコードの検出器インデックス
+    - min_travel_times: 検出器インデックス間の最小移動時間行列
+
+    戻り値: (judged, route_events)
+    - judged: 各レコードの is_judged（None は走査で触れなかったレコード）
+    - route_events: ルートに追加されるレコードの (位置, 新クラスタ開始か) のリスト
+    """
+    n = len(det_idx)
+    judged: List[Optional[bool]] = [None] * n
+    judged[0] = True  # 最初のレコードを判定済みとする
+    route_events = [(0, True)]
+
+    prev = 0
+    last_det = det_idx[0]  # ルートシーケンス末尾の検出器
+    i = 1
+    while i < n:
+        judged[i] = True
+        curr_det = det_idx[i]
+
+        # 直前と同じ検出器ならスキップ（移動なし）
+        if curr_det == last_det:
+            prev = i
+            i += 1
+            continue
+
+        prev_det = det_idx[prev]
+        prev_row = min_travel_times[prev_det]
+        time_diff = (times_us[i] - times_us[prev]) / 1_000_000
+
+        # 不可能移動判定
+        if time_diff < prev_row[curr_det] * impossible_factor:
+            judged[i] = False  # 不可能移動レコードは判定に使用しない
+            # lookahead 探索: prev から到達可能な最初のレコードを採用
+            found = -1
+            for j in range(i + 1, min(i + 1 + max_lookahead, n)):
+                candidate_time_diff = (times_us[j] - times_us[prev]) / 1_000_000
+                if candidate_time_diff >= prev_row[det_idx[j]] * impossible_factor:
+                    found = j
+                    break
+
+            if found >= 0:
+                # ブリッジ成功: 不可能だった current を無視し、到達可能な candidate を採用
+                judged[found] = True
+                if det_idx[found] != last_det:  # 重複検出器防止
+                    route_events.append((found, False))
+                    last_det = det_idx[found]
+                prev = found
+                i = found + 1  # 採用レコードの次から継続
+            else:
+                # ブリッジ失敗: current を新クラスタの開始点にして分割
+                route_events.append((i, True))
+                last_det = curr_det
+                prev = i
+                i += 1
+            continue
+
+        # 正常移動: ルートへ追加
+        route_events.append((i, False))
+        last_det = curr_det
+        prev = i
+        i += 1
+
+    return judged, route_events
+
+
 def classify_records_by_impossible_move_and_window(
     payload_records_collection: PayloadRecordsCollection,
     detectors: Dict[str, Detector],
@@ -39,100 +117,54 @@ def classify_records_by_impossible_move_and_window(
     {"payload1_cluster1": "ABCD", "payload1_cluster2": "ACE", ...}
     """
     estimated_clustered_routes: Dict[str, str] = {}
-    cluster_counter = defaultdict(int)
+
+    # 検出器ペアごとの最小移動時間は一度だけ計算し、走査ではリストとして参照する
+    detector_index, min_travel_matrix = calculate_min_travel_time_matrix(
+        detectors, walker_speed
+    )
+    min_travel_times = min_travel_matrix.tolist()
 
     for payload_id, records in payload_records_collection.records_by_payload.items():
         if not records:
             continue
 
-        # 新しいクラスタ開始
-        cluster_counter[payload_id] += 1
-        current_cluster_id = f"{payload_id}_cluster{cluster_counter[payload_id]}"
-        records[0].is_judged = True  # 最初のレコードを判定済みとする
-        route_sequence: List[str] = [records[0].detector_id]
-
-        prev_record = records[0]
-        prev_record.is_judged = True  # prev_recordも判定済みとする
-        i = 1  # while でインデックス制御（lookaheadジャンプに対応）
-
-        while i < len(records):
-            current_record = records[i]
-            current_record.is_judged = True  # current_recordも判定済みとする
-
-            prev_det_id = prev_record.detector_id
-            curr_det_id = current_record.detector_id
-
-            # 直前と同じ検出器ならスキップ（移動なし）
-            if curr_det_id == route_sequence[-1]:
-                prev_record = current_record
-                i += 1
-                continue
-
-            time_diff = (
-                current_record.timestamp - prev_record.timestamp
-            ).total_seconds()
-            det_prev = detectors[prev_det_id]
-            det_curr = detectors[curr_det_id]
-            min_travel_time = calculate_min_travel_time(
-                det_prev, det_curr, walker_speed
-            )
-
-            # 不可能移動判定
-            if time_diff < min_travel_time * impossible_factor:
-                current_record.is_judged = False  # 不可能移動レコードは判定に使用しない
-                # lookahead 探索
-                look_found_index: Optional[int] = None
-                for j in range(i + 1, min(i + 1 + max_lookahead, len(records))):
-                    candidate = records[j]
-                    candidate_time_diff = (
-                        candidate.timestamp - prev_record.timestamp
-                    ).total_seconds()
-                    det_candidate = detectors[candidate.detector_id]
-                    min_t_candidate = calculate_min_travel_time(
-                        det_prev, det_candidate, walker_speed
-                    )
-                    # 到達可能ならそのレコードを採用
-                    if candidate_time_diff >= min_t_candidate * impossible_factor:
-                        look_found_index = j
-                        break
-
-                if look_found_index is not None:
-                    # ブリッジ成功: 不可能だった current を無視し、到達可能な candidate を採用
-                    candidate_record = records[look_found_index]
-                    candidate_record.is_judged = (
-                        True  # 採用されたレコードも判定済みとする
+        detector_ids = [record.detector_id for record in records]
+        times_us = (
+            np.array([record.timestamp for record in records], dtype="datetime64[us]")
+            .astype(np.int64)
+            .tolist()
+        )
+        judged, route_events = _sweep_with_lookahead(
+            times_us,
+            [detector_index[d_id] for d_id in detector_ids],
+            min_travel_times,
+            max_lookahead,
+            impossible_factor,
+        )
+
+        for record, is_judged in zip(records, judged):
+            if is_judged is not None:
+                record.is_judged = is_judged
+
+        # ルートに追加されたレコードからクラスタごとのルート文字列を組み立てる
+        cluster_no = 1
+        route_sequence: List[str] = []
+        for pos, starts_new_cluster in route_events:
+            if starts_new_cluster and route_sequence:
+                # ここまでのルートを確定し新クラスタ開始
+                if len(route_sequence) > 1:
+                    estimated_clustered_routes[f"{payload_id}_cluster{cluster_no}"] = (
+                        "".join(route_sequence)
                     )
-                    # 重複検出器防止
-                    # ここで、重複する検出器IDを持つレコードをスキップ
-                    if candidate_record.detector_id != route_sequence[-1]:
-                        route_sequence.append(candidate_record.detector_id)
-                    prev_record = candidate_record
-                    i = look_found_index + 1  # 採用レコードの次から継続
-                    continue
-                else:
-                    # ブリッジ失敗: ここでクラスタ分割
-                    if len(route_sequence) > 1:
-                        estimated_clustered_routes[current_cluster_id] = "".join(
-                            route_sequence
-                        )
-
-                    cluster_counter[payload_id] += 1
-                    current_cluster_id = (
-                        f"{payload_id}_cluster{cluster_counter[payload_id]}"
-                    )
-                    route_sequence = [curr_det_id]  # current を新クラスタの開始点に
-                    prev_record = current_record
-                    i += 1
-                    continue
-
-            # 正常移動: ルートへ追加
-            route_sequence.append(curr_det_id)
-            prev_record = current_record
-            i += 1
+                cluster_no += 1
+                route_sequence = []
+            route_sequence.append(detector_ids[pos])
 
         # 最終クラスタ確定
         if len(route_sequence) > 1:
-            estimated_clustered_routes[current_cluster_id] = "".join(route_sequence)
+            estimated_clustered_routes[f"{payload_id}_cluster{cluster_no}"] = "".join(
+                route_sequence
+            )
 
     return (
         ClusteredRoutes(routes_by_cluster_id=estimated_clustered_routes),
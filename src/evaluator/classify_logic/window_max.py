@@ -1,6 +1,6 @@
 from collections import defaultdict
 from typing import Dict, List, Optional
-from utils.calculate_function import calculate_min_travel_time
+from utils.calculate_function import calculate_min_travel_time_matrix
 from domain.detector import Detector
 from domain.analysis_results import (
     PayloadRecordsCollection,
@@ -38,6 +38,13 @@ def classify_records_window_max(
     estimated_clustered_routes: Dict[str, str] = {}
     cluster_counter = defaultdict(int)
 
+    # 検出器ペアごとの最小移動時間は一度だけ計算し、ループ内では参照のみ行う
+    # （1要素ずつ参照するので、行列はリストのリストに変換しておく）
+    detector_index, min_travel_matrix = calculate_min_travel_time_matrix(
+        detectors, walker_speed
+    )
+    min_travel_times = min_travel_matrix.tolist()
+
     for payload_id, records in payload_records_collection.records_by_payload.items():
         if not records:
             continue
@@ -52,7 +59,6 @@ def classify_records_window_max(
         route_sequence: List[str] = [records[0].detector_id]
 
         prev_record = records[0]
-        prev_record.is_judged = True  # 最初のprev_recordも判定に使用されるためTrueに
         idx = 1  # while で前方探索/ジャンプ対応
 
         while idx < len(records):
@@ -70,11 +76,9 @@ def classify_records_window_max(
             time_diff = (
                 current_record.timestamp - prev_record.timestamp
             ).total_seconds()
-            det_prev = detectors[prev_det_id]
-            det_curr = detectors[curr_det_id]
-            min_travel_time = calculate_min_travel_time(
-                det_prev, det_curr, walker_speed
-            )
+            min_travel_time = min_travel_times[detector_index[prev_det_id]][
+                detector_index[curr_det_id]
+            ]
 
             # 不可能移動判定
             if time_diff < min_travel_time * impossible_factor:
@@ -93,10 +97,9 @@ def classify_records_window_max(
                     candidate_time_diff = (
                         candidate.timestamp - prev_record.timestamp
                     ).total_seconds()
-                    det_candidate = detectors[candidate.detector_id]
-                    min_t_candidate = calculate_min_travel_time(
-                        det_prev, det_candidate, walker_speed
-                    )
+                    min_t_candidate = min_travel_times[detector_index[prev_det_id]][
+                        detector_index[candidate.detector_id]
+                    ]
 
                     if candidate_time_diff >= min_t_candidate * impossible_factor:
                         found_index = scan_idx
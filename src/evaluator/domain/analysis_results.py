@@ -14,7 +14,7 @@ class RouteAnalysisResult:
     # 将来的に、分析中に生成された他の情報（例: 各クラスタのイベント数など）もここに追加できます。
 
 
-@dataclass
+@dataclass(slots=True)
 class Record:
     """
     _collect_and_sort_records 関数によって収集される個々の検出レコードデータ。
@@ -1,5 +1,6 @@
 import math
 import random
+import numpy as np
 from domain.detector import Detector
 
 
@@ -23,3 +24,19 @@ def calculate_min_travel_time(det1: Detector, det2: Detector, speed: float) -> f
     """検知器AからBへの最小移動時間を計算（ばらつきなし）"""
     distance = math.sqrt((det2.x - det1.x) ** 2 + (det2.y - det1.y) ** 2)
     return distance / speed if speed > 0 else 0
+
+
+def calculate_min_travel_time_matrix(
+    detectors: dict[str, Detector], speed: float
+) -> tuple[dict[str, int], np.ndarray]:
+    """
+    全検知器ペアの最小移動時間を行列として一度だけ計算する。
+    戻り値: (検知器ID -> 行列インデックス の辞書, 最小移動時間行列)
+    """
+    detector_index = {det_id: i for i, det_id in enumerate(detectors)}
+    det_list = list(detectors.values())
+    matrix = np.array(
+        [[calculate_min_travel_time(d1, d2, speed) for d2 in det_list] for d1 in det_list],
+        dtype=float,
+    )
+    return detector_index, matrix
@@ -1,25 +1,29 @@
+import functools
+import importlib
+
+# ロジック名 -> "モジュールパス:関数名" の対応表
+# 選択されたロジックのモジュールだけを遅延インポートする
+_LOGIC = {
+    "by_impossible_move": (
+        "classify_logic.by_impossible_move:classify_records_by_impossible_move"
+    ),
+    "by_impossible_move_and_window": (
+        "classify_logic.by_impossible_move_and_window:"
+        "classify_records_by_impossible_move_and_window"
+    ),
+    "window_max": "classify_logic.window_max:classify_records_window_max",
+}
+
+
+@functools.lru_cache(maxsize=None)
 def choose_classify_logic(logic_name):
     """
     指定されたロジック名に基づいて分類関数を返す。
+    解決済みの関数はロジック名ごとにキャッシュされる。
     """
-    if logic_name == "by_impossible_move":
-        from classify_logic.by_impossible_move import (
-            classify_records_by_impossible_move,
-        )
-
-        return classify_records_by_impossible_move
-
-    elif logic_name == "by_impossible_move_and_window":
-        from classify_logic.by_impossible_move_and_window import (
-            classify_records_by_impossible_move_and_window,
-        )
-
-        return classify_records_by_impossible_move_and_window
-
-    elif logic_name == "window_max":
-        from classify_logic.window_max import classify_records_window_max
-
-        return classify_records_window_max
-
-    else:
+    target = _LOGIC.get(logic_name)
+    if target is None:
         raise ValueError(f"未知の分類ロジック名: {logic_name}")
+
+    module_name, func_name = target.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
@@ -1,5 +1,6 @@
 from collections import defaultdict
 from typing import Dict, List, Any
+import pandas as pd
 from domain.detector import Detector
 from domain.analysis_results import (
     Record,
@@ -13,30 +14,18 @@ def collect_and_sort_records(
     """ログデータからHashed_Payloadごとのレコードを収集し、時間順にソートする
     具体例：{"payload_1": [record1, record2], "payload_2": [record3], ...}
 
+    検出器の対応付け・ペイロード統合・ソートは DataFrame 上で一括に行い、
+    Record オブジェクトはグループ分けが確定した後に一度だけ生成する。
     """
-    payload_records_raw = defaultdict(list)
-    for log_entry in logs:
-        current_detector_id = None
-        for det_id, det_obj in detectors.items():
-            if (
-                det_obj.x == log_entry["Detector_X"]
-                and det_obj.y == log_entry["Detector_Y"]
-            ):
-                current_detector_id = det_id
-                break
-        if current_detector_id:
-            payload_records_raw[log_entry["Hashed_Payload"]].append(
-                Record(
-                    timestamp=log_entry["Timestamp"],
-                    detector_id=current_detector_id,
-                    walker_id=log_entry["Walker_ID"],  # Walker_ID を追加
-                    detector_x=log_entry["Detector_X"],
-                    detector_y=log_entry["Detector_Y"],
-                    sequence_number=log_entry["Sequence_Number"],  # 追加
-                )
-            )
-
     records_by_payload: Dict[str, List[Record]] = defaultdict(list)
+    if not logs:
+        return PayloadRecordsCollection(records_by_payload=records_by_payload)
+
+    # 座標 (x, y) -> 検出器ID の索引を一度だけ構築する
+    # 同一座標の検出器が複数ある場合は、従来どおり先に定義された方を優先
+    coord_index: Dict[tuple[float, float], str] = {}
+    for det_id, det_obj in detectors.items():
+        coord_index.setdefault((det_obj.x, det_obj.y), det_id)
 
     # ハードコードされたペイロード統合ルールを適用
     # 今回はペイロード自体を文字列で代替している
@@ -49,12 +38,46 @@ def collect_and_sort_records(
         integrated_payload_mapping[base_payload] = integrated_payload
         integrated_payload_mapping[sub_payload] = integrated_payload
 
-    for payload_id, records in payload_records_raw.items():
-        target_payload_id = integrated_payload_mapping.get(payload_id, payload_id)
-        records_by_payload[target_payload_id].extend(records)
+    # インデックスは logs 内の位置（Record 生成時に元の値を参照する）
+    df = pd.DataFrame(
+        logs, columns=["Hashed_Payload", "Timestamp", "Detector_X", "Detector_Y"]
+    )
+
+    # 座標から検出器IDを一括で対応付け、該当なしのログは除外
+    df["Detector_ID"] = df.set_index(["Detector_X", "Detector_Y"]).index.map(
+        coord_index
+    )
+    df = df[df["Detector_ID"].fillna("") != ""]
 
-    # 統合されたペイロードのレコードを時間順にソートし直す
-    for payload_id, records in records_by_payload.items():
-        records.sort(key=lambda x: x.timestamp)
+    df["Target_Payload"] = (
+        df["Hashed_Payload"]
+        .map(integrated_payload_mapping)
+        .fillna(df["Hashed_Payload"])
+    )
+
+    # 並び順を従来の逐次処理と一致させる:
+    # - ペイロードは初出順
+    # - 同一ペイロード内は時刻順、同時刻なら統合前ペイロードの初出順 → ログ順
+    df["_target_order"] = pd.factorize(df["Target_Payload"])[0]
+    df["_raw_order"] = pd.factorize(df["Hashed_Payload"])[0]
+    df["_log_pos"] = df.index
+    df = df.sort_values(
+        ["_target_order", "Timestamp", "_raw_order", "_log_pos"], kind="stable"
+    )
+
+    for payload_id, group in df.groupby("Target_Payload", sort=False):
+        records_by_payload[payload_id] = [
+            Record(
+                timestamp=logs[pos]["Timestamp"],
+                detector_id=det_id,
+                walker_id=logs[pos]["Walker_ID"],  # Walker_ID を追加
+                detector_x=logs[pos]["Detector_X"],
+                detector_y=logs[pos]["Detector_Y"],
+                sequence_number=logs[pos]["Sequence_Number"],  # 追加
+            )
+            for pos, det_id in zip(
+                group["_log_pos"].tolist(), group["Detector_ID"].tolist()
+            )
+        ]
 
     return PayloadRecordsCollection(records_by_payload=records_by_payload)
@@ -2,17 +2,85 @@ import os
 import csv
 import gzip
 import glob
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from datetime import datetime
+import numpy as np
 from domain.analysis_results import PayloadRecordsCollection
 
+# CSV書き出し時のファイルバッファサイズ（1 MiB）
+_WRITE_BUFFER_SIZE = 1024 * 1024
 
-def _format_timestamp(ts: datetime) -> str:
+# ファイル名安全化用の変換表（ASCIIの英数字以外を '_' に置換）
+_SAFE_ID_TRANS = str.maketrans(
+    {ch: "_" for ch in map(chr, range(128)) if not ch.isalnum()}
+)
+
+
+def _format_timestamps(timestamps: list[datetime]) -> list[str]:
     """
-    既存ログ形式に合わせてミリ秒まで出力（最後の3桁切り捨て）:
+    既存ログ形式に合わせてミリ秒まで出力（ミリ秒未満は切り捨て）:
     YYYY-MM-DD HH:MM:SS.mmm
+    datetime64 配列に変換し、全件をまとめて文字列化する。
+    """
+    ts_arr = np.array(timestamps, dtype="datetime64[us]")
+    return np.char.replace(
+        np.datetime_as_string(ts_arr, unit="ms"), "T", " "
+    ).tolist()
+
+
+def _write_payload_file(
+    file_path: str,
+    payload_id: str,
+    records: list,
+    gzip_compress: bool,
+    coord_strs: dict[tuple[float, float], tuple[str, str]],
+) -> tuple[str, int, str, str]:
     """
-    return ts.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    1ペイロード分のレコードをCSV（または .csv.gz）に書き出し、index.csv 用の行を返す。
+    coord_strs は座標の書式化結果のキャッシュ（呼び出し間で共有）。
+    """
+    if gzip_compress:
+        f_open = gzip.open  # type: ignore
+        mode = "wt"
+        open_kwargs = {}
+    else:
+        f_open = open
+        mode = "w"
+        open_kwargs = {"buffering": _WRITE_BUFFER_SIZE}
+
+    with f_open(file_path, mode, newline="", **open_kwargs) as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "Payload_ID",
+                "Timestamp",
+                "Walker_ID",  # Walker_ID を追加
+                "Detector_ID",
+                "Detector_X",
+                "Detector_Y",
+                "Sequence_Number",
+                "Is_Judged",
+            ]
+        )
+        ts_strs = _format_timestamps([rec.timestamp for rec in records])
+        for x, y in {(rec.detector_x, rec.detector_y) for rec in records}:
+            if (x, y) not in coord_strs:
+                coord_strs[(x, y)] = (f"{x:.6f}", f"{y:.6f}")
+        writer.writerows(
+            [
+                payload_id,
+                ts_str,
+                rec.walker_id,  # Walker_ID を追加
+                rec.detector_id,
+                *coord_strs[(rec.detector_x, rec.detector_y)],
+                rec.sequence_number,
+                rec.is_judged,
+            ]
+            for rec, ts_str in zip(records, ts_strs)  # rec: Record
+        )
+
+    return (payload_id, len(records), ts_strs[0], ts_strs[-1])
 
 
 def export_payload_records(
@@ -46,65 +114,44 @@ def export_payload_records(
                     os.remove(fp)
                 except OSError:
                     pass
-    written_files: list[str] = []
-    index_rows: list[tuple[str, int, str, str]] = []
+    # 座標 -> 書式化済み文字列 (x, y) のキャッシュ（検出器の数だけ書式化すればよい）
+    coord_strs: dict[tuple[float, float], tuple[str, str]] = {}
 
+    tasks: list[tuple[str, str, list]] = []
     for payload_id, records in payload_records_collection.records_by_payload.items():
         if not records:
             continue
 
         # ペイロードIDのファイル名安全化（英数字以外は '_'）
-        safe_id = "".join(ch if ch.isalnum() else "_" for ch in payload_id)
+        # ASCIIのみのIDは変換表で一括置換し、それ以外は1文字ずつ判定する
+        if payload_id.isascii():
+            safe_id = payload_id.translate(_SAFE_ID_TRANS)
+        else:
+            safe_id = "".join(ch if ch.isalnum() else "_" for ch in payload_id)
         filename = f"payload_{safe_id}.csv"
         if gzip_compress:
             filename += ".gz"
-        file_path = os.path.join(output_dir, filename)
-
-        if gzip_compress:
-            f_open = gzip.open  # type: ignore
-            mode = "wt"
-        else:
-            f_open = open
-            mode = "w"
-
-        with f_open(file_path, mode, newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(
-                [
-                    "Payload_ID",
-                    "Timestamp",
-                    "Walker_ID",  # Walker_ID を追加
-                    "Detector_ID",
-                    "Detector_X",
-                    "Detector_Y",
-                    "Sequence_Number",
-                    "Is_Judged",
-                ]
-            )
-            for rec in records:  # rec: CollectedRecord
-                writer.writerow(
-                    [
-                        payload_id,
-                        _format_timestamp(rec.timestamp),
-                        rec.walker_id,  # Walker_ID を追加
-                        rec.detector_id,
-                        f"{rec.detector_x:.6f}",
-                        f"{rec.detector_y:.6f}",
-                        rec.sequence_number,
-                        rec.is_judged,
-                    ]
-                )
-
-        written_files.append(file_path)
-
-        first_ts = _format_timestamp(records[0].timestamp)
-        last_ts = _format_timestamp(records[-1].timestamp)
-        index_rows.append((payload_id, len(records), first_ts, last_ts))
+        tasks.append((os.path.join(output_dir, filename), payload_id, records))
+
+    def write_one(task: tuple[str, str, list]) -> tuple[str, int, str, str]:
+        file_path, payload_id, records = task
+        return _write_payload_file(
+            file_path, payload_id, records, gzip_compress, coord_strs
+        )
+
+    # gzip 圧縮は zlib が GIL を解放するため、ペイロードファイル単位でスレッド並列に書き出す
+    # （安全化後のファイル名が衝突する場合は上書き順を保つため逐次実行）
+    written_files = [task[0] for task in tasks]
+    if gzip_compress and len(set(written_files)) == len(written_files):
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            index_rows = list(executor.map(write_one, tasks))
+    else:
+        index_rows = [write_one(task) for task in tasks]
 
     index_file: Optional[str] = None
     if include_index:
         index_file = os.path.join(output_dir, "index.csv")
-        with open(index_file, "w", newline="") as f:
+        with open(index_file, "w", newline="", buffering=_WRITE_BUFFER_SIZE) as f:
             writer = csv.writer(f)
             writer.writerow(
                 ["Payload_ID", "NumRecords", "FirstTimestamp", "LastTimestamp"]
@@ -1,23 +1,55 @@
+import copy
 import json
 import os
 import csv
 import math
+import functools
+from operator import itemgetter
 from datetime import datetime
 import re
 
+try:
+    import orjson  # 利用可能なら高速なJSONパーサを使う
+except ImportError:
+    orjson = None
 
-def load_jsonc(file_path: str) -> dict:
+# 行コメント // とブロックコメント /* */ を1パスで削除する正規表現
+_JSONC_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def _parse_json(content: str) -> dict:
     """
-    JSONCファイルを読み込み、コメントを削除してJSONとしてパースする。
+    JSON文字列をパースする（orjson があれば orjson を使う）。
+    orjson が受け付けない入力（NaN など）は標準の json で読み直す。
     """
-    with open(file_path, "r") as f:
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_jsonc_cached(abs_path: str, mtime: float) -> dict:
+    """load_jsonc の実体。mtime はキャッシュキーとしてのみ使用する。"""
+    with open(abs_path, "r") as f:
         content = f.read()
     # コメントを削除 (行コメント // とブロックコメント /* */)
-    # 行コメント
-    content = re.sub(r"//.*", "", content)
-    # ブロックコメント (複数行対応)
-    content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
-    return json.loads(content)
+    # コメントを含まないファイルは正規表現による置換を省略する
+    if "//" in content or "/*" in content:
+        content = _JSONC_COMMENT_RE.sub("", content)
+    return _parse_json(content)
+
+
+def load_jsonc(file_path: str) -> dict:
+    """
+    JSONCファイルを読み込み、コメントを削除してJSONとしてパースする。
+    パース結果は (絶対パス, 更新時刻) ごとにキャッシュし、呼び出し側には
+    コピーを返す（戻り値を変更してもキャッシュには影響しない）。
+    """
+    abs_path = os.path.abspath(file_path)
+    return copy.deepcopy(_load_jsonc_cached(abs_path, os.path.getmtime(abs_path)))
 
 
 def load_logs(log_dir: str) -> list[dict]:
@@ -52,7 +84,7 @@ def load_logs(log_dir: str) -> list[dict]:
                     row["Sequence_Number"] = int(row["Sequence_Number"])
                     all_logs.append(row)
     # タイムスタンプで全体をソート
-    all_logs.sort(key=lambda x: x["Timestamp"])
+    all_logs.sort(key=itemgetter("Timestamp"))
     return all_logs
 
 
@@ -3,6 +3,8 @@ from utils.load import load_jsonc
 
 
 class Detector:
+    __slots__ = ("id", "x", "y")
+
     def __init__(self, id: str, x: float, y: float):
         self.id = id
         self.x = x
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectionRecord:
     """
     検出器によって記録されたスマートフォンの検出レコードを表すデータクラス。
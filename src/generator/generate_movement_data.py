@@ -1,25 +1,38 @@
 import csv
+import functools
+import glob
+import itertools
 import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 import os
 from collections import defaultdict
+import numpy as np
 from domain.detector import Detector, load_detectors
 from domain.walker import Walker
-from domain.record import DetectionRecord
-from utils.calculate_function import calculate_travel_time
+from utils.calculate_function import (
+    calculate_distance_matrix,
+    calculate_route_travel_times,
+)
 from utils.load import load_payloads, load_simulation_settings
 
+# ログ書き出し時のファイルバッファサイズ（1 MiB）
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
 
 # --- シミュレーション用データの生成 ---
-def generate_random_route_string(detectors: dict[str, Detector]) -> str:
+def generate_random_route_strings(
+    detectors: dict[str, Detector], num_routes: int, rng: np.random.Generator
+) -> list[str]:
     """
-    指定された検出器のリストに基づいて、ランダムな順序のルート文字列を生成します。
+    指定された検出器のリストに基づいて、ランダムな順序のルート文字列を num_routes 個生成します。
+    乱数行列の行ごとの argsort で全ルート分の順列を一度に求めます。
 
     例：ABCDという計4つの検知器を持つ場合、"ACBD"や"DBCA"などのランダムな順序の文字列を返します。
     """
-    detector_ids = list(detectors.keys())
-    random.shuffle(detector_ids)
-    return "".join(detector_ids)
+    detector_ids = np.array(list(detectors.keys()))
+    permutations = np.argsort(rng.random((num_routes, detector_ids.size)), axis=1)
+    return ["".join(route) for route in detector_ids[permutations].tolist()]
 
 
 def create_walkers(
@@ -28,14 +41,20 @@ def create_walkers(
     model_names: list[str],
     model_probabilities: list[float],
     payload_definitions: dict,
+    rng: np.random.Generator | None = None,
 ) -> dict[str, Walker]:
     """
     指定された数と設定に基づいて、Walkerオブジェクトの辞書を生成します。
     各ウォーカーにランダムなルートとスマートフォンモデルを割り当てます。
     返される辞書のキーはウォーカーID、値は対応するWalkerオブジェクトです。
+    ルートの乱数は rng から生成します（省略時は random モジュールの状態から導出）。
 
     例：{"Walker_1": Walker(...), "Walker_2": Walker(...)}
     """
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    routes = generate_random_route_strings(detectors, num_walkers, rng)
+
     walkers = {}
     for i in range(num_walkers):
         walker_id = f"Walker_{i + 1}"  # ウォーカーIDを生成 1から始まる連番
@@ -61,37 +80,202 @@ def create_walkers(
             id=walker_id,
             model=assigned_model_name,
             assigned_payload_id=assigned_payload_id,
-            route=generate_random_route_string(detectors),
+            route=routes[i],
         )
     return walkers
 
 
+def build_payload_cum_probs(
+    payload_distributions: dict,
+) -> dict[str, tuple[list[str], list[float]]]:
+    """
+    静的ペイロード分布を持つモデルごとに (ペイロード種別リスト, 累積確率リスト) を構築します。
+    動的ペイロードのモデルは対象外です。シミュレーション開始時に一度だけ呼び出します。
+    """
+    return {
+        model_name: (
+            list(distribution.keys()),
+            list(itertools.accumulate(distribution.values())),
+        )
+        for model_name, distribution in payload_distributions.items()
+        if "dynamic_unique_payload" not in distribution
+    }
+
+
+def _get_payload_cum_probs(
+    model_name: str,
+    payload_cum_probs: dict[str, tuple[list[str], list[float]]],
+) -> tuple[list[str], list[float]]:
+    """
+    指定されたモデルの (ペイロード種別リスト, 累積確率リスト) を取得します。
+    分布が未定義または空の場合は ValueError を送出します。
+    """
+    entry = payload_cum_probs.get(model_name)
+    if entry is None or not entry[0]:
+        raise ValueError(f"Payload distribution for model '{model_name}' not found.")
+    return entry
+
+
 def choose_payload_for_model(
-    model_name: str, assigned_payload_id: str | None, payload_distributions: dict
-) -> str:
+    model_name: str,
+    assigned_payload_id: str | None,
+    payload_cum_probs: dict[str, tuple[list[str], list[float]]],
+    rng: random.Random | None = None,
+    k: int = 1,
+) -> list[str]:
     """
-    指定されたモデルの確率分布に基づいて、ペイロードをランダムに選択します。
-    動的ペイロードの場合は、割り当てられたIDをそのまま返します。
+    指定されたモデルの確率分布に基づいて、ペイロードを k 個ランダムに選択します。
+    動的ペイロードの場合は、割り当てられたIDを k 個並べて返します。
+    payload_cum_probs は build_payload_cum_probs で事前計算した累積確率です。
+    rng を渡した場合はその乱数生成器を使用します（省略時は random モジュール）。
     """
     if (
         assigned_payload_id
     ):  # このウォーカーに動的ペイロードが割り当てられている場合はそのまま
-        return assigned_payload_id
+        return [assigned_payload_id] * k
 
-    # 静的に定義されたペイロード分布を取得
-    distribution = payload_distributions.get(model_name)
-    if not distribution:
-        raise ValueError(f"Payload distribution for model '{model_name}' not found.")
+    # 静的に定義されたペイロード分布（累積確率）を取得
+    payload_types, cum_weights = _get_payload_cum_probs(model_name, payload_cum_probs)
+
+    # 累積確率を直接渡し、random.choices 内部での累積計算を省く
+    return (rng or random).choices(payload_types, cum_weights=cum_weights, k=k)
 
-    payload_types = list(distribution.keys())
-    probabilities = list(distribution.values())
 
-    # モデルごとに定義された確率分布に基づいてペイロードを1つ選択
-    chosen_payload: str = random.choices(payload_types, weights=probabilities, k=1)[0]
-    return chosen_payload
+def _choose_payloads(
+    model_name: str,
+    assigned_payload_id: str | None,
+    payload_cum_probs: dict[str, tuple[list[str], list[float]]],
+    size: int,
+    rng: np.random.Generator,
+) -> list[str]:
+    """
+    choose_payload_for_model の一括版です。累積確率を二分探索して size 個のペイロードをまとめて選択します。
+    """
+    if assigned_payload_id:
+        return [assigned_payload_id] * size
+
+    payload_types, cum_weights = _get_payload_cum_probs(model_name, payload_cum_probs)
+    cum_probs = np.asarray(cum_weights)
+
+    indices = np.searchsorted(cum_probs, rng.random(size) * cum_probs[-1], side="right")
+    # 浮動小数点誤差で末尾を超えた場合は最後の種別に丸める
+    indices = np.minimum(indices, len(payload_types) - 1)
+    return [payload_types[idx] for idx in indices.tolist()]
 
 
 # --- シミュレーションの実行 ---
+def _simulate_walker(
+    walker: Walker,
+    seed: int,
+    detectors: dict[str, Detector],
+    detector_index: dict[str, int],
+    distance_matrix: np.ndarray,
+    payload_cum_probs: dict[str, tuple[list[str], list[float]]],
+    payloads_per_detector: int,
+    walker_speed: float,
+    variation_factor: float,
+    num_consecutive_payloads: int,
+    start_time: datetime,
+) -> dict[str, tuple[np.ndarray, list[str], list[int]]]:
+    """
+    1人のウォーカーの検出レコードを生成し、検出器IDごとの辞書で返します。
+    値は (タイムスタンプ配列 datetime64[us], ペイロード列, シーケンス番号列) の列指向データです。
+    乱数はウォーカー固有のシードから生成するため、他のウォーカーとは独立に実行できます。
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    # タイムスタンプは datetime64 配列のチャンクとして蓄積し、最後に連結する
+    walker_logs: dict[str, tuple[list[np.ndarray], list[str], list[int]]] = {}
+
+    current_time = start_time
+    assigned_model_name = walker.model
+    assigned_payload_id_for_walker = walker.assigned_payload_id
+
+    route_str = walker.route
+    route_detectors = [detectors[d_id] for d_id in route_str]
+
+    # ルート上の全区間の移動時間を距離行列からまとめて算出
+    route_indices = np.array([detector_index[d_id] for d_id in route_str], dtype=int)
+    travel_durations = calculate_route_travel_times(
+        distance_matrix, route_indices, walker_speed, variation_factor, np_rng
+    ).tolist()
+
+    for i in range(len(route_detectors)):
+        current_detector = route_detectors[i]
+
+        # 生成するレコードは列ごとに保持する（時刻順の並べ替えは書き出し時にまとめて行う）
+        timestamp_chunks, payloads, sequence_numbers = walker_logs.setdefault(
+            current_detector.id, ([], [], [])
+        )
+
+        # 連続ペイロードの生成
+        if num_consecutive_payloads > 0:
+            # 連続ペイロードの開始オフセットをランダムに決定
+            # random.randintの引数は整数である必要があるため、int()で変換
+            consecutive_start_offset = rng.randint(
+                0, int(300 - (num_consecutive_payloads * 0.001))
+            )
+            current_sequence_number = rng.randint(
+                0, 4095
+            )  # 最初の連続ペイロードのシーケンス番号
+
+            payloads.extend(
+                choose_payload_for_model(
+                    assigned_model_name,
+                    assigned_payload_id_for_walker,
+                    payload_cum_probs,
+                    rng,
+                    k=num_consecutive_payloads,
+                )
+            )
+            # 連続ペイロードは開始時刻から1ミリ秒間隔
+            timestamp_chunks.append(
+                np.datetime64(current_time, "us")
+                + np.timedelta64(consecutive_start_offset, "s")
+                + np.arange(num_consecutive_payloads).astype("timedelta64[ms]")
+            )
+            for _ in range(num_consecutive_payloads):
+                sequence_numbers.append(current_sequence_number)
+                current_sequence_number = (
+                    current_sequence_number + 1
+                ) % 4096  # 次のシーケンス番号
+
+        # 残りのペイロード（連続ペイロード以外の部分）の生成
+        # オフセット・ペイロード・シーケンス番号はまとめて乱数生成する
+        num_random_payloads = max(payloads_per_detector - num_consecutive_payloads, 0)
+        offsets = np_rng.integers(0, 301, size=num_random_payloads)
+        timestamp_chunks.append(
+            np.datetime64(current_time, "us") + offsets.astype("timedelta64[s]")
+        )
+        payloads.extend(
+            _choose_payloads(
+                assigned_model_name,
+                assigned_payload_id_for_walker,
+                payload_cum_probs,
+                num_random_payloads,
+                np_rng,
+            )
+        )
+        sequence_numbers.extend(
+            np_rng.integers(0, 4096, size=num_random_payloads).tolist()
+        )
+
+        # 次の検出器への移動
+        if i < len(route_detectors) - 1:
+            current_time += timedelta(seconds=travel_durations[i])
+        else:
+            current_time += timedelta(minutes=rng.randint(1, 5))
+
+    return {
+        det_id: (
+            np.concatenate(timestamp_chunks).astype("datetime64[us]"),
+            payloads,
+            sequence_numbers,
+        )
+        for det_id, (timestamp_chunks, payloads, sequence_numbers) in walker_logs.items()
+    }
+
+
 def simulate(
     detectors: dict[str, Detector],
     walkers: dict[str, Walker],  # Walkerオブジェクトの辞書を受け取る
@@ -100,164 +284,137 @@ def simulate(
     walker_speed: float,
     variation_factor: float,
     num_consecutive_payloads: int,
+    base_seed: int | None = None,
+    max_workers: int | None = None,
 ):
     """
     スマートフォンの検出シミュレーションを実行し、ログファイルを生成します。
+
+    各ウォーカーのレコード生成はプロセスプールで並列に実行します。
+    ウォーカー i の乱数シードは base_seed + i（base_seed 省略時は random から決定）で、
+    max_workers に関係なく同じ結果になります。max_workers=1 の場合は逐次実行します。
     """
     results_dir = "result"
     os.makedirs(results_dir, exist_ok=True)
 
-    # 既存のログファイルを削除
-    for filename in os.listdir(results_dir):
-        if filename.endswith("_log.csv") or filename == "walker_routes.csv":
-            os.remove(os.path.join(results_dir, filename))
-
     # ウォーカールートをCSVファイルに保存
-    with open(os.path.join(results_dir, "walker_routes.csv"), "w", newline="") as f:
+    with open(
+        os.path.join(results_dir, "walker_routes.csv"),
+        "w",
+        newline="",
+        buffering=_WRITE_BUFFER_SIZE,
+    ) as f:
         writer = csv.writer(f)
         writer.writerow(
             ["Walker_ID", "Route", "Model", "Assigned_Hashed_Payload_If_Dynamic"]
         )
-        for walker_id, walker in walkers.items():
-            assigned_payload_info = (
-                walker.assigned_payload_id if walker.assigned_payload_id else "N/A"
+        writer.writerows(
+            (
+                walker.id,
+                walker.route,
+                walker.model,
+                walker.assigned_payload_id if walker.assigned_payload_id else "N/A",
             )
-            writer.writerow(
-                [walker.id, walker.route, walker.model, assigned_payload_info]
-            )
-
-    # 検出器ごとのログデータを一時的に保持
-    detector_logs = defaultdict(list)
+            for walker in walkers.values()
+        )
 
     # シミュレーション開始時刻
     start_time = datetime(2024, 1, 14, 11, 0, 0)
 
-    for walker_id, walker in walkers.items():
-        current_time = start_time
-        assigned_model_name = walker.model
-        assigned_payload_id_for_walker = walker.assigned_payload_id
-
-        route_str = walker.route
-        route_detectors = [detectors[d_id] for d_id in route_str]
-
-        for i in range(len(route_detectors)):
-            current_detector = route_detectors[i]
-
-            # 生成するペイロードレコードを一時的に保持するリスト
-            records_to_add = []
+    # ウォーカーごとのシードを導出（ワーカー数に関係なく結果を再現可能にする）
+    if base_seed is None:
+        base_seed = random.randrange(2**32)
+    walker_list = list(walkers.values())
+    walker_seeds = [base_seed + i for i in range(len(walker_list))]
+
+    # 検出器間の距離行列は全ウォーカーで共有するため一度だけ計算
+    detector_index = {det_id: i for i, det_id in enumerate(detectors)}
+    distance_matrix = calculate_distance_matrix(list(detectors.values()))
+
+    simulate_one = functools.partial(
+        _simulate_walker,
+        detectors=detectors,
+        detector_index=detector_index,
+        distance_matrix=distance_matrix,
+        payload_cum_probs=build_payload_cum_probs(payload_distributions),
+        payloads_per_detector=payloads_per_detector,
+        walker_speed=walker_speed,
+        variation_factor=variation_factor,
+        num_consecutive_payloads=num_consecutive_payloads,
+        start_time=start_time,
+    )
 
-            # 連続ペイロードの生成
-            if num_consecutive_payloads > 0:
-                # 連続ペイロードの開始オフセットをランダムに決定
-                # random.randintの引数は整数である必要があるため、int()で変換
-                consecutive_start_offset = random.randint(
-                    0, int(300 - (num_consecutive_payloads * 0.001))
-                )
-                current_sequence_number = random.randint(
-                    0, 4095
-                )  # 最初の連続ペイロードのシーケンス番号
-
-                for k in range(num_consecutive_payloads):
-                    record_time = (
-                        current_time
-                        + timedelta(seconds=consecutive_start_offset)
-                        + timedelta(milliseconds=k)
-                    )
-                    chosen_payload = choose_payload_for_model(
-                        assigned_model_name,
-                        assigned_payload_id_for_walker,
-                        payload_distributions,
-                    )
-                    records_to_add.append(
-                        DetectionRecord(
-                            timestamp=record_time,
-                            walker_id=walker.id,
-                            hashed_payload=chosen_payload,
-                            detector_id=current_detector.id,
-                            detector_x=current_detector.x,
-                            detector_y=current_detector.y,
-                            sequence_number=current_sequence_number,
-                        )
-                    )
-                    current_sequence_number = (
-                        current_sequence_number + 1
-                    ) % 4096  # 次のシーケンス番号
-
-            # 残りのペイロード（連続ペイロード以外の部分）の生成
-            num_random_payloads = payloads_per_detector - num_consecutive_payloads
-            for _ in range(num_random_payloads):
-                offset_seconds = random.randint(0, 300)
-                record_time = current_time + timedelta(seconds=offset_seconds)
-                chosen_payload = choose_payload_for_model(
-                    assigned_model_name,
-                    assigned_payload_id_for_walker,
-                    payload_distributions,
-                )
-                random_sequence_number = random.randint(0, 4095)
-                records_to_add.append(
-                    DetectionRecord(
-                        timestamp=record_time,
-                        walker_id=walker.id,
-                        hashed_payload=chosen_payload,
-                        detector_id=current_detector.id,
-                        detector_x=current_detector.x,
-                        detector_y=current_detector.y,
-                        sequence_number=random_sequence_number,
-                    )
-                )
+    # 各ウォーカーは互いに独立なので、プロセスプールで並列に生成する
+    if max_workers == 1:
+        walker_results = list(map(simulate_one, walker_list, walker_seeds))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            walker_results = list(
+                executor.map(simulate_one, walker_list, walker_seeds)
+            )
 
-            # 生成されたすべてのレコードをタイムスタンプでソートして追加
-            records_to_add.sort(key=lambda x: x.timestamp)
-            detector_logs[current_detector.id].extend(records_to_add)
-
-            # 次の検出器への移動
-            if i < len(route_detectors) - 1:
-                next_detector = route_detectors[i + 1]
-                travel_duration = calculate_travel_time(
-                    current_detector.x,
-                    current_detector.y,
-                    next_detector.x,
-                    next_detector.y,
-                    walker_speed,
-                    variation_factor,
-                )
-                current_time += timedelta(seconds=travel_duration)
-            else:
-                current_time += timedelta(minutes=random.randint(1, 5))
-
-    # 各検出器のログをファイルに書き出し、タイムスタンプでソート
-    for det_id, logs in detector_logs.items():
-        logs.sort(
-            key=lambda x: x.timestamp
-        )  # DetectionRecordオブジェクトのtimestampでソート
+    # ウォーカーごとの部分ログを検出器ごとの列データに統合（ウォーカー順を維持）
+    # 検出器ID・座標はファイルごとに一定なので行ごとには保持しない
+    detector_cols = defaultdict(lambda: {"ts": [], "wid": [], "hp": [], "seq": []})
+    for walker, partial_logs in zip(walker_list, walker_results):
+        for det_id, (timestamps, payloads, sequence_numbers) in partial_logs.items():
+            cols = detector_cols[det_id]
+            cols["ts"].append(timestamps)
+            cols["wid"].extend([walker.id] * len(timestamps))
+            cols["hp"].extend(payloads)
+            cols["seq"].extend(sequence_numbers)
+
+    # 既存のログファイルのうち、今回上書きされないものだけを削除
+    # 上書きされるファイルは "w" で開いた時点で切り詰められるため、削除と再作成は不要
+    written_log_files = {
+        os.path.join(results_dir, f"{det_id}_log.csv") for det_id in detector_cols
+    }
+    for file_path in glob.iglob(os.path.join(results_dir, "*_log.csv")):
+        if file_path in written_log_files:
+            continue
+        try:
+            os.unlink(file_path)
+        except FileNotFoundError:
+            pass
+
+    # 各検出器のログをタイムスタンプ順（同時刻は生成順）に並べてファイルに書き出す
+    for det_id, cols in detector_cols.items():
+        timestamps = np.concatenate(cols["ts"])
+        order = np.argsort(timestamps, kind="stable")
+        # ミリ秒まで（それ未満は切り捨て）の文字列に一括変換
+        timestamp_strs = np.char.replace(
+            np.datetime_as_string(timestamps[order], unit="ms"), "T", " "
+        ).tolist()
+        detector = detectors[det_id]
         file_path = os.path.join(results_dir, f"{det_id}_log.csv")
-        with open(file_path, "w", newline="") as f:
-            fieldnames = [
-                "Timestamp",
-                "Walker_ID",
-                "Hashed_Payload",
-                "Detector_ID",
-                "Detector_X",
-                "Detector_Y",
-                "Sequence_Number",
-            ]
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            for entry in logs:
-                # DetectionRecordオブジェクトの属性からデータを書き出す
-                writer.writerow(
-                    {
-                        "Timestamp": entry.timestamp.strftime("%Y-%m-%d %H:%M:%S.%f")[
-                            :-3
-                        ],
-                        "Walker_ID": entry.walker_id,
-                        "Hashed_Payload": entry.hashed_payload,
-                        "Detector_ID": entry.detector_id,
-                        "Detector_X": entry.detector_x,
-                        "Detector_Y": entry.detector_y,
-                        "Sequence_Number": entry.sequence_number,
-                    }
-                )
+        walker_ids, payloads, sequence_numbers = cols["wid"], cols["hp"], cols["seq"]
+        # 行はリストに溜めず、書き出し時にジェネレータから直接生成する
+        rows = (
+            (
+                timestamp_str,
+                walker_ids[idx],
+                payloads[idx],
+                detector.id,
+                detector.x,
+                detector.y,
+                sequence_numbers[idx],
+            )
+            for timestamp_str, idx in zip(timestamp_strs, order.tolist())
+        )
+        with open(file_path, "w", newline="", buffering=_WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [
+                    "Timestamp",
+                    "Walker_ID",
+                    "Hashed_Payload",
+                    "Detector_ID",
+                    "Detector_X",
+                    "Detector_Y",
+                    "Sequence_Number",
+                ]
+            )
+            writer.writerows(rows)
 
     print(f"シミュレーションログを '{results_dir}' フォルダに生成しました。")
 
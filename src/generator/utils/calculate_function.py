@@ -1,19 +1,27 @@
 import math
 import random
+import numpy as np
 from domain.detector import Detector
 
 
 def calculate_travel_time(
-    ax: float, ay: float, bx: float, by: float, speed: float, variation_factor: float
+    ax: float,
+    ay: float,
+    bx: float,
+    by: float,
+    speed: float,
+    variation_factor: float,
+    rng: random.Random | None = None,
 ) -> float:
     """
     2つの座標間のユークリッド距離を計算し、定義された速度とばらつき要因に基づいて移動時間を算出します。
+    rng を渡した場合はその乱数生成器でばらつきを決定します（省略時は random モジュール）。
     """
     distance = math.sqrt((bx - ax) ** 2 + (by - ay) ** 2)
     base_time = distance / speed if speed > 0 else 0
     # ランダムなばらつきを追加
     variation = (
-        base_time * variation_factor * (random.random() * 2 - 1)
+        base_time * variation_factor * ((rng or random).random() * 2 - 1)
     )  # -variation_factorから+variation_factorの範囲
     travel_time = max(0, base_time + variation)
     return travel_time
@@ -23,3 +31,31 @@ def calculate_min_travel_time(det1: Detector, det2: Detector, speed: float) -> f
     """検知器AからBへの最小移動時間を計算（ばらつきなし）"""
     distance = math.sqrt((det2.x - det1.x) ** 2 + (det2.y - det1.y) ** 2)
     return distance / speed if speed > 0 else 0
+
+
+def calculate_distance_matrix(detectors: list[Detector]) -> np.ndarray:
+    """検知器間のユークリッド距離行列を計算（detectors の並び順でインデックス付け）"""
+    coords = np.array([[det.x, det.y] for det in detectors], dtype=float)
+    diff = coords[:, None, :] - coords[None, :, :]
+    return np.sqrt((diff**2).sum(axis=-1))
+
+
+def calculate_route_travel_times(
+    distance_matrix: np.ndarray,
+    route_indices: np.ndarray,
+    speed: float,
+    variation_factor: float,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    ルート上の連続する検知器間の移動時間をまとめて算出します。
+    calculate_travel_time と同じ式（ばらつき ±variation_factor、0未満は0）をベクトル演算で適用し、
+    長さ len(route_indices) - 1 の配列を返します。
+    """
+    distances = distance_matrix[route_indices[:-1], route_indices[1:]]
+    base_times = distances / speed if speed > 0 else np.zeros_like(distances)
+    # ランダムなばらつきを追加（-variation_factorから+variation_factorの範囲）
+    variations = (
+        base_times * variation_factor * rng.uniform(-1.0, 1.0, size=base_times.size)
+    )
+    return np.maximum(0.0, base_times + variations)
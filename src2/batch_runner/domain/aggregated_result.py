@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MetricStatistics:
     """メトリクスの統計情報
 
@@ -36,7 +36,7 @@ class MetricStatistics:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConditionResult:
     """1つの条件（num_walkers × time_bin）の結果
 
@@ -64,7 +64,7 @@ class ConditionResult:
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AggregatedResult:
     """全体の集約結果
 
@@ -1,9 +1,11 @@
 """実験設定のドメインモデル"""
 
 from dataclasses import dataclass, field
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
+
 
 @dataclass
 class ExperimentConfig:
@@ -15,9 +17,12 @@ class ExperimentConfig:
         num_walkers_list: 評価するnum_walkersのリスト
         num_runs: 各条件での実行回数
         output_dir: 出力ディレクトリ
-        base_seed: 乱数シードのベース値（各実行でインクリメント）
+        base_seed: 乱数シードのベース値（SeedSequence で各実行のシードを派生）
         time_bin_minutes: 評価時の時間ビン幅（分）
         compare_time_bins: 比較モード用の時間ビンリスト（指定時は比較モード）
+        defer_writes: True の場合、実行ごとの seed.txt と条件ごとのサマリーJSONを
+            書き出さず、実験終了時に seeds.json と final_summary.json にまとめる
+        numeric_metric_keys: 集約対象の数値メトリクス名（実験全体で共通、出力順もこの順）
 
     Examples:
         >>> config = ExperimentConfig(
@@ -41,6 +46,22 @@ class ExperimentConfig:
     base_seed: int = 42
     time_bin_minutes: int = 30
     compare_time_bins: List[int] = field(default_factory=list)
+    defer_writes: bool = True
+    numeric_metric_keys: Tuple[str, ...] = (
+        "mae",
+        "rmse",
+        "tracking_rate",
+        "total_gt_count",
+        "total_est_count",
+        "total_absolute_error",
+    )
+    _experiment_id: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    # get_seed 用のキャッシュ: (キャッシュ作成時の設定値, num_walkers -> 位置, 全実行のシード)
+    _seed_cache: Optional[
+        Tuple[Tuple[int, Tuple[int, ...], int], Dict[int, int], List[int]]
+    ] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def is_compare_mode(self) -> bool:
@@ -70,18 +91,45 @@ class ExperimentConfig:
 
         Returns:
             シード値
+
+        Notes:
+            base_seed の SeedSequence から全実行分の子シーケンスを一度に派生させ、
+            各子から32bitのシードを取り出す（初回呼び出し時に計算してキャッシュ）。
+            連番シードと違い、実行間で乱数列が相関しない。
+            キャッシュは base_seed, num_walkers_list, num_runs の値に対して作るので、
+            これらを後から変更した場合は作り直される。
         """
-        # num_walkersとrun_indexから一意のシードを生成
-        walkers_index = self.num_walkers_list.index(num_walkers)
-        return self.base_seed + walkers_index * 10000 + run_index
+        cache_key = (self.base_seed, tuple(self.num_walkers_list), self.num_runs)
+        if self._seed_cache is None or self._seed_cache[0] != cache_key:
+            # num_walkers -> リスト内の位置（毎回線形探索しないため）
+            walkers_index: Dict[int, int] = {}
+            for i, walkers in enumerate(self.num_walkers_list):
+                walkers_index.setdefault(walkers, i)
+            children = np.random.SeedSequence(self.base_seed).spawn(
+                len(self.num_walkers_list) * self.num_runs
+            )
+            run_seeds = [int(child.generate_state(1)[0]) for child in children]
+            self._seed_cache = (cache_key, walkers_index, run_seeds)
+        _, walkers_index, run_seeds = self._seed_cache
+
+        position = walkers_index.get(num_walkers)
+        if position is None:
+            raise ValueError(f"{num_walkers} is not in num_walkers_list")
+        if not 0 <= run_index < self.num_runs:
+            raise ValueError(f"run_index {run_index} is out of range")
+        return run_seeds[position * self.num_runs + run_index]
 
     def get_experiment_id(self) -> str:
-        """実験IDを生成
+        """実験IDを取得
+
+        初回呼び出し時の時刻から生成し、以降は同じIDを返す。
 
         Returns:
             実験ID（例: "exp_20250610_143000"）
         """
-        return datetime.now().strftime("exp_%Y%m%d_%H%M%S")
+        if self._experiment_id is None:
+            self._experiment_id = datetime.now().strftime("exp_%Y%m%d_%H%M%S")
+        return self._experiment_id
 
     def to_dict(self) -> dict:
         """辞書形式に変換
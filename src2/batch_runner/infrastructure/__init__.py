@@ -1,17 +1,20 @@
 """バッチ実験のインフラストラクチャ層"""
 
-from .result_aggregator import aggregate_metrics
+from .result_aggregator import aggregate_metrics, RunningStatistics
 from .experiment_writer import (
     write_experiment_config,
     write_condition_summary,
     write_final_summary,
     write_seed_file,
+    write_seeds_file,
 )
 
 __all__ = [
     "aggregate_metrics",
+    "RunningStatistics",
     "write_experiment_config",
     "write_condition_summary",
     "write_final_summary",
     "write_seed_file",
+    "write_seeds_file",
 ]
@@ -3,10 +3,44 @@
 import json
 from pathlib import Path
 from datetime import datetime
+from typing import Dict
 
 from ..domain.experiment_config import ExperimentConfig
 from ..domain.aggregated_result import ConditionResult, AggregatedResult
 
+try:
+    import orjson  # 利用可能なら高速なJSONシリアライザを使う
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+
+    def _dumps(data: dict) -> bytes:
+        """辞書をインデント付きJSONのバイト列に変換（orjson）"""
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+else:
+
+    def _dumps(data: dict) -> bytes:
+        """辞書をインデント付きJSONのバイト列に変換（標準の json）"""
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """辞書をインデント付きJSONとして書き出す
+
+    シリアライザはインポート時に1度だけ選択し（orjson がなければ標準の json）、
+    エンコード済みのバイト列を1回の書き込みで出力する。
+
+    Args:
+        path: 出力パス
+        data: 書き出す辞書
+    """
+    path.write_bytes(_dumps(data))
+
 
 def write_experiment_config(config: ExperimentConfig, experiment_dir: str) -> None:
     """実験設定を保存
@@ -24,8 +58,7 @@ def write_experiment_config(config: ExperimentConfig, experiment_dir: str) -> No
         **config.to_dict(),
     }
 
-    with open(config_path, "w", encoding="utf-8") as f:
-        json.dump(config_data, f, indent=2, ensure_ascii=False)
+    _write_json(config_path, config_data)
 
 
 def write_condition_summary(result: ConditionResult, output_path: str) -> None:
@@ -38,8 +71,7 @@ def write_condition_summary(result: ConditionResult, output_path: str) -> None:
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+    _write_json(output_file, result.to_dict())
 
 
 def write_final_summary(result: AggregatedResult, output_path: str) -> None:
@@ -52,8 +84,7 @@ def write_final_summary(result: AggregatedResult, output_path: str) -> None:
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(result.to_dict(), f, indent=2, ensure_ascii=False)
+    _write_json(output_file, result.to_dict())
 
 
 def write_seed_file(run_dir: str, seed: int) -> None:
@@ -67,5 +98,18 @@ def write_seed_file(run_dir: str, seed: int) -> None:
     output_path.mkdir(parents=True, exist_ok=True)
 
     seed_path = output_path / "seed.txt"
-    with open(seed_path, "w", encoding="utf-8") as f:
-        f.write(str(seed))
+    seed_path.write_text(str(seed), encoding="utf-8")
+
+
+def write_seeds_file(experiment_dir: str, seeds: Dict[str, Dict[str, int]]) -> None:
+    """全実行のシードを1つのJSONファイルにまとめて保存
+
+    Args:
+        experiment_dir: 実験ディレクトリ
+        seeds: 条件ディレクトリ名 -> (実行ディレクトリ名 -> シード値)
+            例: {"walkers_050": {"run_001": 42, "run_002": 43}}
+    """
+    output_path = Path(experiment_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    _write_json(output_path / "seeds.json", seeds)
@@ -4,10 +4,138 @@
 """
 
 import math
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, Union
+
+import numpy as np
 
 from ..domain.aggregated_result import MetricStatistics
 
+# 標準正規分布の97.5パーセンタイル
+_Z_975 = 1.959963984540054
+
+
+def _t_value(df: int) -> float:
+    """自由度dfのt分布の97.5パーセンタイルを求める
+
+    Hill (1970, ACM Algorithm 396) の近似式で計算する（誤差はおおむね1e-3未満）。
+    自由度1, 2は厳密な閉形式、自由度0以下は正規分布の近似値を返す。
+
+    Args:
+        df: 自由度
+
+    Returns:
+        t値
+    """
+    p2 = 0.05  # 両側確率
+    if df <= 0:
+        return 1.96  # フォールバック（正規分布の近似）
+    if df == 1:
+        return 1.0 / math.tan(p2 * math.pi / 2)
+    if df == 2:
+        return math.sqrt(2.0 / (p2 * (2.0 - p2)) - 2.0)
+
+    a = 1.0 / (df - 0.5)
+    b = 48.0 / (a * a)
+    c = ((20700.0 * a / b - 98.0) * a - 16.0) * a + 96.36
+    d = ((94.5 / (b + c) - 3.0) / b + 1.0) * math.sqrt(a * math.pi / 2) * df
+    y = (d * p2) ** (2.0 / df)
+
+    if y > 0.05 + a:
+        # 正規分布の分位点からの漸近展開
+        x = _Z_975
+        y = x * x
+        if df < 5:
+            c += 0.3 * (df - 4.5) * (x + 0.6)
+        c = (((0.05 * d * x - 5.0) * x - 7.0) * x - 2.0) * x + b + c
+        y = (((((0.4 * y + 6.3) * y + 36.0) * y + 94.5) / c - y - 3.0) / b + 1.0) * x
+        y = a * y * y
+        y = math.expm1(y) if y > 0.002 else 0.5 * y * y + y
+    else:
+        y = (
+            (
+                1.0 / (((df + 6.0) / (df * y) - 0.089 * d - 0.822) * (df + 2.0) * 3.0)
+                + 0.5 / (df + 4.0)
+            )
+            * y
+            - 1.0
+        ) * (df + 1.0) / (df + 2.0) + 1.0 / y
+
+    return math.sqrt(df * y)
+
+
+class RunningStatistics:
+    """1実行分ずつ値を取り込み、統計量を逐次計算する
+
+    平均・分散は Welford 法で更新するため、全実行の値を保持する必要がない。
+    """
+
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Union[int, float, None] = None
+        self.max: Union[int, float, None] = None
+
+    def update(self, value: Union[int, float]) -> None:
+        """値を1つ取り込む
+
+        Args:
+            value: 1実行分のメトリクス値
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+        # 最小・最大は元の値をそのまま保持する（整数メトリクスは整数のまま出力する）
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def finalize(self) -> MetricStatistics:
+        """取り込んだ値から統計情報を構築
+
+        Returns:
+            統計情報（95%信頼区間は t分布を使用）
+        """
+        n = self.count
+        if n == 0:
+            return MetricStatistics(
+                mean=0.0,
+                std=0.0,
+                ci_95_lower=0.0,
+                ci_95_upper=0.0,
+                min=0.0,
+                max=0.0,
+            )
+
+        mean = float(self.mean)
+        if n == 1:
+            # 1件のみ: 標準偏差0、信頼区間は平均値そのもの（t値の計算は不要）
+            return MetricStatistics(
+                mean=mean,
+                std=0.0,
+                ci_95_lower=mean,
+                ci_95_upper=mean,
+                min=self.min,
+                max=self.max,
+            )
+
+        std = math.sqrt(self._m2 / (n - 1))
+        margin = _t_value(n - 1) * std / math.sqrt(n)
+
+        return MetricStatistics(
+            mean=mean,
+            std=std,
+            ci_95_lower=mean - margin,
+            ci_95_upper=mean + margin,
+            min=self.min,
+            max=self.max,
+        )
+
 
 def calculate_statistics(values: List[float]) -> MetricStatistics:
     """値のリストから統計量を計算
@@ -22,7 +150,8 @@ def calculate_statistics(values: List[float]) -> MetricStatistics:
         95%信頼区間は t分布を使用して計算
         （サンプルサイズが小さい場合を考慮）
     """
-    n = len(values)
+    arr = np.asarray(values, dtype=np.float64)
+    n = arr.size
     if n == 0:
         return MetricStatistics(
             mean=0.0,
@@ -32,59 +161,29 @@ def calculate_statistics(values: List[float]) -> MetricStatistics:
             min=0.0,
             max=0.0,
         )
+    if n == 1:
+        # 1件のみ: 標準偏差0、信頼区間は平均値そのもの（t値の計算は不要）
+        mean = float(values[0])
+        return MetricStatistics(
+            mean=mean,
+            std=0.0,
+            ci_95_lower=mean,
+            ci_95_upper=mean,
+            min=values[0],
+            max=values[0],
+        )
 
-    # 平均
-    mean = sum(values) / n
-
-    # 標準偏差（不偏分散）
-    if n > 1:
-        variance = sum((x - mean) ** 2 for x in values) / (n - 1)
-        std = math.sqrt(variance)
-    else:
-        std = 0.0
+    # 平均・標準偏差（不偏分散）は NumPy のリダクションで計算
+    # 平均からの偏差は一度だけ求め、分散はその内積から得る（平均の再計算を避ける）
+    mean = float(arr.mean())
+    deviations = arr - mean
+    std = math.sqrt(float(deviations @ deviations) / (n - 1))
 
     # 95%信頼区間（t分布の近似値を使用）
-    # 自由度n-1のt分布の97.5パーセンタイル
-    t_values = {
-        1: 12.706,
-        2: 4.303,
-        3: 3.182,
-        4: 2.776,
-        5: 2.571,
-        6: 2.447,
-        7: 2.365,
-        8: 2.306,
-        9: 2.262,
-        10: 2.228,
-        15: 2.131,
-        20: 2.086,
-        25: 2.060,
-        30: 2.042,
-        40: 2.021,
-        50: 2.009,
-        100: 1.984,
-    }
-
-    # 最も近いt値を選択
-    df = n - 1
-    if df <= 0:
-        t = 1.96  # フォールバック（正規分布の近似）
-    elif df in t_values:
-        t = t_values[df]
-    elif df > 100:
-        t = 1.96  # 正規分布の近似
-    else:
-        # 線形補間
-        lower_df = max(k for k in t_values.keys() if k <= df)
-        upper_df = min(k for k in t_values.keys() if k >= df)
-        if lower_df == upper_df:
-            t = t_values[lower_df]
-        else:
-            ratio = (df - lower_df) / (upper_df - lower_df)
-            t = t_values[lower_df] + ratio * (t_values[upper_df] - t_values[lower_df])
+    t = _t_value(n - 1)
 
     # 標準誤差
-    se = std / math.sqrt(n) if n > 0 else 0.0
+    se = std / math.sqrt(n)
 
     # 信頼区間
     margin = t * se
@@ -96,18 +195,22 @@ def calculate_statistics(values: List[float]) -> MetricStatistics:
         std=std,
         ci_95_lower=ci_95_lower,
         ci_95_upper=ci_95_upper,
-        min=min(values),
-        max=max(values),
+        # 最小・最大は元の値をそのまま返す（整数メトリクスは整数のまま出力する）
+        min=values[int(arr.argmin())],
+        max=values[int(arr.argmax())],
     )
 
 
 def aggregate_metrics(
     run_results: List[Dict[str, Any]],
+    metric_keys: Optional[Sequence[str]] = None,
 ) -> Dict[str, MetricStatistics]:
     """複数回の実行結果からメトリクスを集約
 
     Args:
         run_results: 各実行の結果辞書のリスト
+        metric_keys: 集約する数値メトリクス名。省略時は最初の実行結果の値から判定する
+            （どの実行結果にも存在しないメトリクスは結果に含めない）
 
     Returns:
         メトリクス名 -> 統計情報のマップ
@@ -124,15 +227,64 @@ def aggregate_metrics(
     if not run_results:
         return {}
 
-    # メトリクス名を取得
-    metric_names = run_results[0].keys()
+    # 数値メトリクスの名前を取得（指定がなければ最初の実行結果の値で判定）
+    if metric_keys is not None:
+        metric_names = list(metric_keys)
+    else:
+        metric_names = [
+            name
+            for name, value in run_results[0].items()
+            if isinstance(value, (int, float))
+        ]
+    if not metric_names:
+        return {}
+
+    # (実行数, メトリクス数) の行列にまとめ、全メトリクスの統計量を軸0方向に一括計算
+    # 値を持たない実行は NaN として集計から除外する
+    arr = np.asarray(
+        [[r.get(name, np.nan) for name in metric_names] for r in run_results],
+        dtype=np.float64,
+    )
+    valid = ~np.isnan(arr)
+
+    # どの実行にも値がないメトリクスは集約しない（統計量を計算できないため）
+    present = valid.any(axis=0)
+    if not present.all():
+        metric_names = [
+            name for name, keep in zip(metric_names, present.tolist()) if keep
+        ]
+        if not metric_names:
+            return {}
+        arr = arr[:, present]
+        valid = valid[:, present]
+
+    counts = valid.sum(axis=0)
+    means = np.where(valid, arr, 0.0).sum(axis=0) / counts
+    deviations = np.where(valid, arr - means, 0.0)
+    sq_sums = (deviations * deviations).sum(axis=0)
+    stds = np.sqrt(
+        np.divide(
+            sq_sums, counts - 1, out=np.zeros_like(sq_sums), where=counts > 1
+        )
+    )
+    margins = [
+        _t_value(int(n) - 1) * float(std) / math.sqrt(n)
+        for n, std in zip(counts.tolist(), stds.tolist())
+    ]
+    min_rows = np.nanargmin(arr, axis=0).tolist()
+    max_rows = np.nanargmax(arr, axis=0).tolist()
 
-    # 各メトリクスの値を収集して統計を計算
     aggregated = {}
-    for metric_name in metric_names:
-        values = [r[metric_name] for r in run_results if metric_name in r]
-        # 数値のみを対象にする
-        if values and isinstance(values[0], (int, float)):
-            aggregated[metric_name] = calculate_statistics(values)
+    for j, metric_name in enumerate(metric_names):
+        mean = float(means[j])
+        aggregated[metric_name] = MetricStatistics(
+            mean=mean,
+            std=float(stds[j]),
+            ci_95_lower=mean - margins[j],
+            ci_95_upper=mean + margins[j],
+            # 最小・最大は元の値をそのまま返す（整数メトリクスは整数のまま出力する）
+            min=run_results[min_rows[j]][metric_name],
+            max=run_results[max_rows[j]][metric_name],
+        )
 
     return aggregated
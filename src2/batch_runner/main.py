@@ -88,6 +88,11 @@ Examples:
         default=None,
         help="比較モード: 複数の時間ビンで評価（例: --compare-bins 15 60 → 15,30,60分で比較）",
     )
+    parser.add_argument(
+        "--verbose-io",
+        action="store_true",
+        help="実行ごとの seed.txt と条件ごとのサマリーJSONも出力する（デフォルト: seeds.json と final_summary.json にまとめて出力）",
+    )
 
     args = parser.parse_args()
 
@@ -115,6 +120,7 @@ Examples:
         base_seed=base_seed,
         time_bin_minutes=args.time_bin,
         compare_time_bins=compare_time_bins,
+        defer_writes=not args.verbose_io,
     )
 
     # 実験を実行
@@ -1,20 +1,26 @@
 """実験実行のユースケース"""
 
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Tuple
 
 from ..domain.experiment_config import ExperimentConfig
 from ..domain.aggregated_result import ConditionResult, AggregatedResult
-from ..infrastructure.result_aggregator import aggregate_metrics
+from ..infrastructure.result_aggregator import RunningStatistics
 from ..infrastructure.experiment_writer import (
     write_experiment_config,
     write_condition_summary,
     write_final_summary,
     write_seed_file,
+    write_seeds_file,
 )
 from ...generator.run import run_generator
 from ...estimator.run import run_estimator
-from ...evaluator.run import run_evaluator
+from ...evaluator.run import run_evaluator_for_bins
 
 
 def run_single_experiment(
@@ -22,6 +28,7 @@ def run_single_experiment(
     run_dir: str,
     seed: int,
     time_bins: List[int],
+    write_seed: bool = True,
 ) -> Dict[int, Dict[str, Any]]:
     """1回のシミュレーションを実行
 
@@ -30,13 +37,15 @@ def run_single_experiment(
         run_dir: 実行結果の出力ディレクトリ
         seed: 乱数シード
         time_bins: 評価する時間ビンのリスト（例: [15, 30, 60]）
+        write_seed: True の場合、実行ディレクトリに seed.txt を書き出す
 
     Returns:
         時間ビンごとの評価結果メトリクス辞書
         例: {15: {...}, 30: {...}, 60: {...}}
     """
-    # シードを記録
-    write_seed_file(run_dir, seed)
+    # シードを記録（まとめて書き出す場合は呼び出し側で seeds.json に記録する）
+    if write_seed:
+        write_seed_file(run_dir, seed)
 
     # 1. データ生成（1回だけ）
     run_generator(
@@ -52,26 +61,32 @@ def run_single_experiment(
         verbose=False,
     )
 
-    # 3. 評価（各時間ビンで実行）
-    ground_truth_path = str(Path(run_dir) / "ground_truth" / "trajectories.json")
-    estimated_path = str(Path(run_dir) / "estimated" / "trajectories.json")
-
-    results_by_bin: Dict[int, Dict[str, Any]] = {}
+    # 3. 評価（軌跡は1回だけ読み込み、各時間ビンで実行）
+    run_path = Path(run_dir)
+    ground_truth_path = str(run_path / "ground_truth" / "trajectories.json")
+    estimated_path = str(run_path / "estimated" / "trajectories.json")
+    evaluation_dir = run_path / "evaluation"
+    is_multi_bin = len(time_bins) > 1
+
+    # 時間ビンごとに別ファイルに出力
+    output_paths = {
+        time_bin: str(
+            evaluation_dir
+            / (f"results_bin{time_bin}.json" if is_multi_bin else "results.json")
+        )
+        for time_bin in time_bins
+    }
 
-    for time_bin in time_bins:
-        # 時間ビンごとに別ディレクトリに出力
-        if len(time_bins) > 1:
-            evaluation_path = str(Path(run_dir) / "evaluation" / f"results_bin{time_bin}.json")
-        else:
-            evaluation_path = str(Path(run_dir) / "evaluation" / "results.json")
+    # 軌跡JSONの読み込みは全時間ビンで1回だけ
+    results = run_evaluator_for_bins(
+        ground_truth_path=ground_truth_path,
+        estimated_path=estimated_path,
+        output_paths=output_paths,
+    )
 
-        result = run_evaluator(
-            ground_truth_path=ground_truth_path,
-            estimated_path=estimated_path,
-            output_path=evaluation_path,
-            time_bin_minutes=time_bin,
-        )
+    results_by_bin: Dict[int, Dict[str, Any]] = {}
 
+    for time_bin, result in results.items():
         # 評価結果からメトリクスを抽出
         metrics = result.overall_metrics
         results_by_bin[time_bin] = {
@@ -86,72 +101,92 @@ def run_single_experiment(
     return results_by_bin
 
 
-def run_condition(
+def _run_single_task(
+    task: Tuple[int, str, int, List[int], bool],
+) -> Dict[int, Dict[str, Any]]:
+    """プロセスプールのワーカーで1回分のシミュレーションを実行
+
+    子プロセスへはdataclassを渡さず、文字列・整数・リストのみを渡す。
+    進捗表示は親プロセスが条件ごとにまとめて行う（ワーカーからは出力しない）。
+
+    Args:
+        task: (通行人数, 実行ディレクトリ, シード, 時間ビンのリスト,
+            seed.txt を書き出すか)
+
+    Returns:
+        時間ビンごとの評価結果メトリクス辞書
+    """
+    num_walkers, run_dir, seed, time_bins, write_seed = task
+
+    return run_single_experiment(
+        num_walkers=num_walkers,
+        run_dir=run_dir,
+        seed=seed,
+        time_bins=time_bins,
+        write_seed=write_seed,
+    )
+
+
+def _summarize_condition(
     num_walkers: int,
     num_runs: int,
     condition_dir: str,
-    config: ExperimentConfig,
+    time_bins: List[int],
+    run_metrics: Iterable[Dict[int, Dict[str, Any]]],
+    metric_keys: Tuple[str, ...],
+    write_summary: bool = True,
 ) -> Dict[int, ConditionResult]:
-    """1つの条件（num_walkers）で複数回実行
+    """1つの条件（num_walkers）の全実行結果を時間ビンごとに集約
 
     Args:
         num_walkers: 通行人数
         num_runs: 実行回数
         condition_dir: 条件の出力ディレクトリ
-        config: 実験設定
+        time_bins: 評価した時間ビンのリスト
+        run_metrics: 各実行の時間ビンごとのメトリクス辞書（実行順）。
+            1件ずつ統計量に取り込むため、イテレータでもよい。
+        metric_keys: 集約する数値メトリクス名（実験全体で共通）
+        write_summary: True の場合、条件ディレクトリにサマリーJSONを書き出す
 
     Returns:
         時間ビンごとの条件結果
         例: {15: ConditionResult, 30: ConditionResult, 60: ConditionResult}
     """
-    time_bins = config.get_time_bins_to_evaluate()
-
-    # 時間ビンごとの結果を格納
-    run_results_by_bin: Dict[int, List[Dict[str, Any]]] = {
-        tb: [] for tb in time_bins
+    # (時間ビン, メトリクス) ごとの逐次統計量
+    # 各実行の結果は取り込んだ時点で破棄し、生の値は保持しない
+    # メトリクス名は実験全体で固定なので、型判定せずに名前で直接取り出す
+    per_bin_stats: Dict[int, Dict[str, RunningStatistics]] = {
+        tb: {name: RunningStatistics() for name in metric_keys} for tb in time_bins
     }
-
-    for run_idx in range(num_runs):
-        run_num = run_idx + 1
-        run_dir = str(Path(condition_dir) / f"run_{run_num:03d}")
-        seed = config.get_seed(num_walkers, run_idx)
-
-        # 進捗表示
-        print(f"[{num_walkers}人] {run_num}/{num_runs} 実行中...")
-
-        # 1回のシミュレーションを実行（全時間ビンで評価）
-        metrics_by_bin = run_single_experiment(
-            num_walkers=num_walkers,
-            run_dir=run_dir,
-            seed=seed,
-            time_bins=time_bins,
-        )
-
-        # 各時間ビンの結果を振り分け
+    for metrics_by_bin in run_metrics:
         for tb, metrics in metrics_by_bin.items():
-            run_results_by_bin[tb].append(metrics)
+            for name, stats in per_bin_stats[tb].items():
+                stats.update(metrics[name])
 
     # 時間ビンごとに集約
     condition_results: Dict[int, ConditionResult] = {}
+    condition_path = Path(condition_dir)
 
     for tb in time_bins:
-        run_results = run_results_by_bin[tb]
-        metrics_stats = aggregate_metrics(run_results)
+        metrics_stats = {
+            name: stats.finalize() for name, stats in per_bin_stats[tb].items()
+        }
 
         condition_result = ConditionResult(
             num_walkers=num_walkers,
             num_runs=num_runs,
             metrics=metrics_stats,
-            run_results=run_results,
             time_bin=tb,
         )
         condition_results[tb] = condition_result
 
-        # 条件のサマリーを保存
+        # 条件のサマリーを保存（同じ内容は final_summary.json にも含まれる）
+        if not write_summary:
+            continue
         if len(time_bins) > 1:
-            summary_path = str(Path(condition_dir) / f"summary_bin{tb}.json")
+            summary_path = str(condition_path / f"summary_bin{tb}.json")
         else:
-            summary_path = str(Path(condition_dir) / "summary.json")
+            summary_path = str(condition_path / "summary.json")
         write_condition_summary(condition_result, summary_path)
 
     # 結果表示
@@ -196,24 +231,63 @@ def run_experiments(config: ExperimentConfig) -> AggregatedResult:
     # 実験設定を保存
     write_experiment_config(config, experiment_dir)
 
-    # 各条件を実行
+    # 全条件・全実行を (num_walkers, 実行番号) のフラットなタスクに展開し、
+    # 1つのプロセスプールで実行する（実行回数が少なくてもプールを埋められる）
+    num_runs = config.num_runs
+    experiment_path = Path(experiment_dir)
+    condition_paths = [
+        experiment_path / f"walkers_{num_walkers:03d}"
+        for num_walkers in config.num_walkers_list
+    ]
+    condition_dirs = [str(path) for path in condition_paths]
+    tasks = [
+        (
+            num_walkers,
+            str(condition_path / f"run_{run_idx + 1:03d}"),
+            config.get_seed(num_walkers, run_idx),
+            time_bins,
+            not config.defer_writes,
+        )
+        for num_walkers, condition_path in zip(
+            config.num_walkers_list, condition_paths
+        )
+        for run_idx in range(num_runs)
+    ]
+    max_workers = max(1, min(len(tasks), os.cpu_count() or 1))
+    # Linux では fork で起動し、親でインポート済みの generator/estimator/evaluator を
+    # ワーカーに引き継ぐ（ワーカーごとの再インポートを避ける）
+    # macOS の fork は一部ライブラリで安全でないため、Linux 以外は既定の方式のまま
+    mp_context = (
+        multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+    )
     # 結果はフラットなリストに展開（比較モードでは複数time_bin分）
     condition_results: List[ConditionResult] = []
 
-    for num_walkers in config.num_walkers_list:
-        condition_dir = str(Path(experiment_dir) / f"walkers_{num_walkers:03d}")
-        print()
-
-        results_by_bin = run_condition(
-            num_walkers=num_walkers,
-            num_runs=config.num_runs,
-            condition_dir=condition_dir,
-            config=config,
-        )
-
-        # 時間ビンでソートしてリストに追加
-        for tb in sorted(results_by_bin.keys()):
-            condition_results.append(results_by_bin[tb])
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=mp_context
+    ) as executor:
+        # map は投入順に結果を返すため、条件・実行の順序は逐次実行時と同じ
+        # 結果は一覧にせず、条件ごとに num_runs 件ずつ取り出して逐次集約する
+        run_metrics_iter = executor.map(_run_single_task, tasks)
+
+        for num_walkers, condition_dir in zip(config.num_walkers_list, condition_dirs):
+            # 進捗表示（実行ごとではなく条件ごとに1回だけ出力）
+            print()
+            print(f"[{num_walkers}人] {num_runs}回 実行中...")
+
+            results_by_bin = _summarize_condition(
+                num_walkers=num_walkers,
+                num_runs=num_runs,
+                condition_dir=condition_dir,
+                time_bins=time_bins,
+                run_metrics=islice(run_metrics_iter, num_runs),
+                metric_keys=config.numeric_metric_keys,
+                write_summary=not config.defer_writes,
+            )
+
+            # 時間ビンでソートしてリストに追加
+            for tb in sorted(results_by_bin.keys()):
+                condition_results.append(results_by_bin[tb])
 
     # 全体の結果を構築
     aggregated_result = AggregatedResult(
@@ -223,9 +297,22 @@ def run_experiments(config: ExperimentConfig) -> AggregatedResult:
     )
 
     # 最終サマリーを保存
-    final_summary_path = str(Path(experiment_dir) / "final_summary.json")
+    final_summary_path = str(experiment_path / "final_summary.json")
     write_final_summary(aggregated_result, final_summary_path)
 
+    # 実行ごとの seed.txt の代わりに、全実行のシードを1ファイルにまとめて保存
+    if config.defer_writes:
+        seeds = {
+            condition_path.name: {
+                f"run_{run_idx + 1:03d}": config.get_seed(num_walkers, run_idx)
+                for run_idx in range(num_runs)
+            }
+            for num_walkers, condition_path in zip(
+                config.num_walkers_list, condition_paths
+            )
+        }
+        write_seeds_file(experiment_dir, seeds)
+
     print()
     print("=== 実験完了 ===")
     print(f"結果: {experiment_dir}/")
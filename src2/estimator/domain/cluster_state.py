@@ -1,11 +1,11 @@
 """クラスタリング中の状態を管理するデータクラス"""
 
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import Dict, List, Set
 from .detection_record import DetectionRecord
 
 
-@dataclass
+@dataclass(slots=True)
 class ClusterState:
     """クラスタリング中の状態を保持
 
@@ -16,12 +16,19 @@ class ClusterState:
         cluster_records: このクラスタに属するレコードのリスト
         route_sequence: 推定経路（訪問した検出器IDの順序、例: ["A", "B", "C"]）
         prev_record: 直前に追加したレコード（移動可能性の判定に使用）
+        route_set: route_sequence に含まれる検出器IDの集合（訪問済み判定用）
+        stay_stats: 検出器ID -> [最初の検出時刻, 最後の検出時刻, 検出回数]
+            （レコードの追加と同時に集計、挿入順 = 最初の検出順）
+        _last_detector_id: route_sequence の末尾の検出器ID（空なら ""）
     """
 
     cluster_id: str
     cluster_records: List[DetectionRecord]
     route_sequence: List[str]
     prev_record: DetectionRecord
+    route_set: Set[str] = field(default_factory=set)
+    stay_stats: Dict[str, list] = field(default_factory=dict)
+    _last_detector_id: str = field(default="", init=False, repr=False)
 
     def add_record(self, record: DetectionRecord, add_to_route: bool = False) -> None:
         """レコードをcluster_recordsに追加
@@ -33,25 +40,49 @@ class ClusterState:
                           検出器IDは追加されない。
 
         処理内容:
-            1. レコードの is_judged を True にマーク（使用済み）
-            2. レコードの cluster_id をこのクラスタのIDに設定
-            3. cluster_records にレコードを追加
-            4. add_to_route=True かつ新しい検出器なら推定経路に検出器IDを追加
-            5. prev_record を更新
-        """
-        # レコードを「使用済み」にマーク
-        record.is_judged = True
-        record.cluster_id = self.cluster_id
+            1. cluster_records にレコードを追加
+            2. add_to_route=True かつ新しい検出器なら推定経路（と route_set）に検出器IDを追加
+            3. 検出器ごとの滞在の集計（stay_stats）を更新
+            4. prev_record を更新
 
+        Note:
+            is_judged / cluster_id の更新はクラスタ確定時に mark_records() で
+            まとめて行う。走査は常に追加済みレコードより後ろへ進むため、
+            抽出中に追加済みレコードの is_judged が参照されることはない。
+        """
         # cluster_recordsにレコードを追加
         self.cluster_records.append(record)
 
         # 推定経路への検出器ID追加
         if add_to_route:
-            # route_sequence が空、または異なる検出器なら追加
+            # 末尾と異なる検出器なら追加（空の場合は "" と比較するので必ず追加される）
             # （同じ検出器での連続検知は推定経路には追加しない）
-            if not self.route_sequence or record.detector_id != self.route_sequence[-1]:
-                self.route_sequence.append(record.detector_id)
+            detector_id = record.detector_id
+            if detector_id != self._last_detector_id:
+                self.route_sequence.append(detector_id)
+                self.route_set.add(detector_id)
+                self._last_detector_id = detector_id
+
+        # 検出器ごとの滞在を集計
+        # レコードは時系列順に追加されるので、最後に追加した時刻 = 最後の検出時刻
+        timestamp = record.timestamp
+        stat = self.stay_stats.get(record.detector_id)
+        if stat is None:
+            self.stay_stats[record.detector_id] = [timestamp, timestamp, 1]
+        else:
+            stat[1] = timestamp
+            stat[2] += 1
 
         # 「直前のレコード」を更新
         self.prev_record = record
+
+    def mark_records(self) -> None:
+        """cluster_records のレコードをまとめて「使用済み」にマーク
+
+        各レコードの is_judged を True に、cluster_id をこのクラスタのIDに設定する。
+        クラスタの抽出が終わった時点で1回だけ呼び出す。
+        """
+        cluster_id = self.cluster_id
+        for record in self.cluster_records:
+            record.is_judged = True
+            record.cluster_id = cluster_id
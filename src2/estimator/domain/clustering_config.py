@@ -1,8 +1,12 @@
 """クラスタリング設定を管理するデータクラス"""
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
 from ...shared.domain.detector import Detector
+from ...shared.utils.distance_calculator import calculate_min_travel_time
 
 
 @dataclass
@@ -18,9 +22,51 @@ class ClusteringConfig:
         impossible_factor: ありえない移動判定の係数、デフォルト 0.8
             → 最小移動時間の80%未満で到着 = ありえない
         allow_long_stays: 長時間滞在を許可するか、デフォルト False
+        debug: クラスタリング過程の詳細ログを出すか、デフォルト False
+            → False ならログの呼び出し自体を行わない（出力先は logging の設定に従う）
+        detector_index: 検出器ID -> min_travel_matrix の行・列番号
+        min_travel_matrix: 検出器間の最小移動時間（秒）の N×N 行列
+            初期化時に全ペアを一度だけ計算する（判定ごとの距離計算を避ける）
+            min_travel_matrix[detector_index[id1]][detector_index[id2]] で参照する
+        min_travel_array: min_travel_matrix と同じ値の NumPy 配列
+        impossible_threshold_matrix: ありえない移動と判定する時間差の下限（秒）の N×N 行列
+            = min_travel_matrix × impossible_factor（判定ごとの掛け算を避ける）
+            移動時間がこの値未満ならありえない移動
+        impossible_threshold_array: impossible_threshold_matrix と同じ値の NumPy 配列
+            （前方探索で複数レコードをまとめて判定する際に使用）
     """
 
     detectors: Dict[str, Detector]
     walker_speed: float = 1.4
     impossible_factor: float = 0.8
     allow_long_stays: bool = False
+    debug: bool = False
+    detector_index: Dict[str, int] = field(init=False, repr=False, compare=False)
+    min_travel_matrix: List[List[float]] = field(
+        init=False, repr=False, compare=False
+    )
+    min_travel_array: np.ndarray = field(init=False, repr=False, compare=False)
+    impossible_threshold_matrix: List[List[float]] = field(
+        init=False, repr=False, compare=False
+    )
+    impossible_threshold_array: np.ndarray = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # 参照は1要素ずつなので、NumPy 配列ではなくリストのリストで持つ
+        # （Python から1要素を取り出すコストはリストの方が小さい）
+        self.detector_index = {
+            detector_id: i for i, detector_id in enumerate(self.detectors)
+        }
+        self.min_travel_matrix = [
+            [
+                calculate_min_travel_time(det1, det2, self.walker_speed)
+                for det2 in self.detectors.values()
+            ]
+            for det1 in self.detectors.values()
+        ]
+        self.min_travel_array = np.array(self.min_travel_matrix, dtype=np.float64)
+        # 要素ごとの掛け算なので、判定時に毎回掛けるのと同じ値になる
+        self.impossible_threshold_array = self.min_travel_array * self.impossible_factor
+        self.impossible_threshold_matrix = self.impossible_threshold_array.tolist()
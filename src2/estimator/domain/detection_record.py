@@ -1,15 +1,20 @@
 """検出レコード（Estimator用）"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional
 
+from ...shared.utils.datetime_utils import to_epoch_microseconds
 
-@dataclass
+
+@dataclass(slots=True)
 class DetectionRecord:
     """検出ログから読み込んだレコード
 
     Estimatorでは walker_id は使用しない（Ground Truth情報のため）。
     is_judged フラグはクラスタリング処理で使用される。
+    timestamp_us は時刻差の計算用に timestamp をエポックからのマイクロ秒にしたもの
+    （省略時は timestamp から計算する）。
 
     Examples:
         >>> from datetime import datetime
@@ -30,3 +35,8 @@ class DetectionRecord:
     sequence_number: int  # シーケンス番号（0-4095）
     is_judged: bool = False  # クラスタリング処理済みフラグ
     cluster_id: str = ""  # 所属クラスタID（クラスタリング時に設定）
+    timestamp_us: Optional[int] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.timestamp_us is None:
+            self.timestamp_us = to_epoch_microseconds(self.timestamp)
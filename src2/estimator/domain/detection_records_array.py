@@ -0,0 +1,84 @@
+"""検出レコードの列指向（SoA）表現"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+from .detection_record import DetectionRecord
+
+
+@dataclass(frozen=True, slots=True)
+class DetectionRecordsArray:
+    """検出レコード群を列ごとの NumPy 配列で保持する
+
+    レコードごとに DetectionRecord を作らず、列（フィールド）ごとに連続した
+    配列として保持する。検出器IDは detector_ids への整数コードで表す。
+    既存の処理には view() / to_records() で DetectionRecord に変換して渡す。
+
+    Attributes:
+        timestamps: 検出時刻（datetime64[us]）
+        walker_ids: Walker ID（object配列）
+        hashed_ids: ペイロードのハッシュ値（object配列）
+        detector_codes: 検出器コード（detector_ids のインデックス）
+        sequence_numbers: シーケンス番号（int32）
+        detector_ids: コード -> 検出器ID の対応表
+
+    Examples:
+        >>> records = read_detector_logs_array("src2_result/detector_logs")
+        >>> records.view(0).detector_id == records.detector_ids[records.detector_codes[0]]
+        True
+    """
+
+    timestamps: np.ndarray
+    walker_ids: np.ndarray
+    hashed_ids: np.ndarray
+    detector_codes: np.ndarray
+    sequence_numbers: np.ndarray
+    detector_ids: Tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def view(self, idx: int) -> DetectionRecord:
+        """idx 番目のレコードを DetectionRecord として取り出す
+
+        Args:
+            idx: レコードのインデックス
+
+        Returns:
+            DetectionRecord（is_judged=False）
+        """
+        return DetectionRecord(
+            timestamp=self.timestamps[idx].item(),
+            walker_id=self.walker_ids[idx],
+            hashed_id=self.hashed_ids[idx],
+            detector_id=self.detector_ids[self.detector_codes[idx]],
+            sequence_number=int(self.sequence_numbers[idx]),
+            is_judged=False,
+            timestamp_us=int(self.timestamps[idx].astype(np.int64)),
+        )
+
+    def to_records(self) -> List[DetectionRecord]:
+        """全レコードを DetectionRecord のリストに変換
+
+        列ごとに Python オブジェクトへ一括変換してから組み立てる。
+        timestamp_us も datetime64[us] の整数値からそのまま設定する。
+
+        Returns:
+            DetectionRecord のリスト（配列と同じ順序）
+        """
+        detector_ids = np.array(self.detector_ids, dtype=object)
+        return [
+            DetectionRecord(
+                ts, walker_id, hashed_id, detector_id, seq, False, "", ts_us
+            )
+            for ts, ts_us, walker_id, hashed_id, detector_id, seq in zip(
+                self.timestamps.tolist(),
+                self.timestamps.astype(np.int64).tolist(),
+                self.walker_ids.tolist(),
+                self.hashed_ids.tolist(),
+                detector_ids[self.detector_codes].tolist(),
+                self.sequence_numbers.tolist(),
+            )
+        ]
@@ -5,7 +5,7 @@ from typing import List
 from .estimated_stay import EstimatedStay
 
 
-@dataclass
+@dataclass(slots=True)
 class EstimatedTrajectory:
     """推定された1つの軌跡
 
@@ -1,10 +1,94 @@
 """クラスタリング結果のCSV出力"""
 
 import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from ..domain.detection_record import DetectionRecord
-from ...shared.utils.datetime_utils import format_timestamp
+from ...shared.utils.datetime_utils import format_timestamps
+from .csv_bytes import join_csv_rows, write_csv_body
+from .file_naming import safe_hash
+
+# クラスタCSVのヘッダー
+_HEADER = (
+    "Integrated_Hash",
+    "Original_Hash",
+    "Timestamp",
+    "Walker_ID",
+    "Detector_ID",
+    "Sequence_Number",
+    "Is_Judged",  # クラスタリングで使用されたか
+    "Cluster_ID",  # 所属クラスタID
+)
+
+# CSV書き出し時のファイルバッファサイズ（1 MiB）
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def _write_cluster_file(
+    file_path: Path, integrated_hash: str, records: List[DetectionRecord]
+) -> Tuple[str, int, int, int, str, str]:
+    """1ハッシュ分のレコードをCSVに書き出し、summary.csv 用の行を返す
+
+    Args:
+        file_path: 出力ファイルパス
+        integrated_hash: 統合ハッシュ値
+        records: このハッシュのレコードリスト
+
+    Returns:
+        (統合ハッシュ, 総数, 使用済み数, 未使用数, 最初の時刻, 最後の時刻)
+    """
+    # is_judged の統計（内包表記で絞り込んで数える方が sum(ジェネレータ) より速い）
+    judged_count = len([r for r in records if r.is_judged])
+    unjudged_count = len(records) - judged_count
+
+    # タイムスタンプは1ファイル分まとめて文字列化する
+    ts_strs = format_timestamps([record.timestamp for record in records])
+
+    # 値はすべてクォート不要な想定なので、行を直接整形してバイト列で書き出す
+    # 統合ハッシュの列は全行で共通なので、行ごとには埋め込まず連結時に付ける
+    body = join_csv_rows(
+        [
+            f"{record.hashed_id},{ts_str},{record.walker_id},{record.detector_id},"
+            f"{record.sequence_number},{record.is_judged},{record.cluster_id}"
+            for record, ts_str in zip(records, ts_strs)
+        ],
+        prefix=f"{integrated_hash},",
+    )
+    if not write_csv_body(file_path, _HEADER, body, len(records), len(_HEADER)):
+        # クォートが必要な値が含まれる場合は csv.writer で書き出す
+        with open(
+            file_path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            writer = csv.writer(f)
+
+            # ヘッダー
+            writer.writerow(_HEADER)
+
+            # データ（行はジェネレータで渡し、writerows でまとめて書き出す）
+            writer.writerows(
+                (
+                    integrated_hash,
+                    record.hashed_id,
+                    ts_str,
+                    record.walker_id,
+                    record.detector_id,
+                    record.sequence_number,
+                    record.is_judged,
+                    record.cluster_id,
+                )
+                for record, ts_str in zip(records, ts_strs)
+            )
+
+    return (
+        integrated_hash,
+        len(records),
+        judged_count,
+        unjudged_count,
+        ts_strs[0],
+        ts_strs[-1],
+    )
 
 
 def export_clustering_results(
@@ -52,87 +136,47 @@ def export_clustering_results(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # 既存ファイルを削除
+    # 既存ファイルを削除（ディレクトリの走査は1回だけ）
     if clean_before:
-        for pattern in ["cluster_*.csv", "summary.csv"]:
-            for file_path in output_path.glob(pattern):
-                try:
-                    file_path.unlink()
-                except OSError:
-                    pass
-
-    written_files: List[str] = []
-    summary_rows: List[tuple] = []
-    total_judged = 0
-    total_unjudged = 0
+        with os.scandir(output_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith("cluster_") and name.endswith(".csv")
+                ) or name == "summary.csv":
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+
+    tasks: List[Tuple[Path, str, List[DetectionRecord]]] = []
 
     # ペイロードごとにCSVファイルを作成
     for integrated_hash, records in grouped_records.items():
         if not records:
             continue
 
-        # ファイル名安全化
-        safe_hash = "".join(ch if ch.isalnum() else "_" for ch in integrated_hash)
-        filename = f"cluster_{safe_hash}.csv"
-        file_path = output_path / filename
-
-        # is_judged の統計
-        judged_count = sum(1 for r in records if r.is_judged)
-        unjudged_count = len(records) - judged_count
-        total_judged += judged_count
-        total_unjudged += unjudged_count
-
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-
-            # ヘッダー
-            writer.writerow(
-                [
-                    "Integrated_Hash",
-                    "Original_Hash",
-                    "Timestamp",
-                    "Walker_ID",
-                    "Detector_ID",
-                    "Sequence_Number",
-                    "Is_Judged",  # クラスタリングで使用されたか
-                    "Cluster_ID",  # 所属クラスタID
-                ]
-            )
+        # ファイル名安全化（英数字以外は '_'）
+        filename = f"cluster_{safe_hash(integrated_hash)}.csv"
+        tasks.append((output_path / filename, integrated_hash, records))
 
-            # データ
-            for record in records:
-                writer.writerow(
-                    [
-                        integrated_hash,
-                        record.hashed_id,
-                        format_timestamp(record.timestamp),
-                        record.walker_id,
-                        record.detector_id,
-                        record.sequence_number,
-                        record.is_judged,
-                        record.cluster_id,
-                    ]
-                )
+    # ファイルごとの書き出しは独立しているため、スレッド並列で書き出す
+    # （安全化後のファイル名が衝突する場合は上書き順を保つため逐次実行）
+    written_files = [str(task[0]) for task in tasks]
+    if len(tasks) > 1 and len(set(written_files)) == len(written_files):
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            summary_rows = list(executor.map(lambda t: _write_cluster_file(*t), tasks))
+    else:
+        summary_rows = [_write_cluster_file(*task) for task in tasks]
 
-        written_files.append(str(file_path))
-
-        # サマリー情報を記録
-        first_ts = format_timestamp(records[0].timestamp)
-        last_ts = format_timestamp(records[-1].timestamp)
-        summary_rows.append(
-            (
-                integrated_hash,
-                len(records),
-                judged_count,
-                unjudged_count,
-                first_ts,
-                last_ts,
-            )
-        )
+    total_judged = sum(row[2] for row in summary_rows)
+    total_unjudged = sum(row[3] for row in summary_rows)
 
     # サマリーファイルを出力
     summary_file = str(output_path / "summary.csv")
-    with open(summary_file, "w", newline="", encoding="utf-8") as f:
+    with open(
+        summary_file, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+    ) as f:
         writer = csv.writer(f)
         writer.writerow(
             [
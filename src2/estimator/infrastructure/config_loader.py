@@ -1,12 +1,49 @@
 """Estimator用の設定ファイル読み込みモジュール"""
 
+import copy
+import functools
 import json
+import os
 import re
 from pathlib import Path
 from typing import Dict, Any, List
 from ...shared.domain.detector import Detector
 from ..domain.clustering_config import ClusteringConfig
 
+# 行コメント (//) とブロックコメント (/* */) を1回の走査で削除する
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+try:
+    import orjson  # 利用可能なら高速なJSONパーサを使う
+except ImportError:
+    orjson = None
+
+
+def _parse_json(content: str) -> Dict[str, Any]:
+    """JSON文字列をパースする（orjson があれば orjson を使う）
+
+    orjson が受け付けない入力（NaN など）は標準の json で読み直す。
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_jsonc_cached(abs_path: str, mtime: float) -> Dict[str, Any]:
+    """JSONCファイルをパースする（キャッシュ用、mtime はキーとしてのみ使用）"""
+    with open(abs_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    # コメントを含まないファイルは正規表現による置換を省略する
+    if "//" in content or "/*" in content:
+        content = _COMMENT_RE.sub("", content)
+
+    return _parse_json(content)
+
 
 def load_jsonc(file_path: str) -> Dict[str, Any]:
     """JSONCファイルを読み込む（コメント付きJSON）
@@ -15,17 +52,14 @@ def load_jsonc(file_path: str) -> Dict[str, Any]:
         file_path: JSONCファイルのパス
 
     Returns:
-        パースされた辞書
-    """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # 行コメント (//) を削除
-    content = re.sub(r"//.*", "", content)
-    # ブロックコメント (/* */) を削除
-    content = re.sub(r"/\*.*?\*/", "", content, flags=re.DOTALL)
+        パースされた辞書（呼び出し側が変更してもキャッシュに影響しないコピー）
 
-    return json.loads(content)
+    Notes:
+        パース結果は (絶対パス, 更新時刻) をキーにキャッシュする。
+        バッチ実行で同じ設定ファイルを実行ごとに読み直さないため。
+    """
+    abs_path = os.path.abspath(file_path)
+    return copy.deepcopy(_load_jsonc_cached(abs_path, os.path.getmtime(abs_path)))
 
 
 def load_detectors(config_dir: str = "config") -> Dict[str, Detector]:
@@ -61,7 +95,7 @@ def load_simulation_settings(config_dir: str = "config") -> Dict[str, Any]:
 
 
 def load_estimator_settings(config_dir: str = "config") -> Dict[str, Any]:
-    """Estimator固有の設定を読み込む（allow_long_stays, max_passes等）
+    """Estimator固有の設定を読み込む（allow_long_stays, max_passes, debug等）
 
     Args:
         config_dir: 設定ファイルディレクトリ
@@ -76,6 +110,8 @@ def load_estimator_settings(config_dir: str = "config") -> Dict[str, Any]:
     # デフォルト値を設定
     settings.setdefault("allow_long_stays", False)
     settings.setdefault("max_passes", 10)
+    settings.setdefault("debug", False)
+    settings.setdefault("grouped_records_single_file", False)
 
     return settings
 
@@ -101,4 +137,5 @@ def load_clustering_config(config_dir: str = "config") -> ClusteringConfig:
         walker_speed=sim_settings.get("walker_speed", 1.4),
         impossible_factor=sim_settings.get("impossible_factor", 0.8),
         allow_long_stays=est_settings.get("allow_long_stays", False),
+        debug=est_settings.get("debug", False),
     )
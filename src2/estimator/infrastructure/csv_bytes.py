@@ -0,0 +1,65 @@
+"""固定スキーマのCSVをバイト列として直接書き出すユーティリティ"""
+
+from pathlib import Path
+from typing import List, Sequence
+
+
+def join_csv_rows(rows: List[str], prefix: str = "") -> str:
+    """整形済みの行を csv.writer と同じ改行 ("\\r\\n") で連結する
+
+    全行に共通する先頭の列（統合ハッシュなど）は prefix で渡すと、
+    行ごとに埋め込まずに区切り文字側へ1回だけ持たせて連結できる。
+
+    Args:
+        rows: 整形済みの行（改行なし、prefix の列は含まない）
+        prefix: 各行の先頭に付ける文字列（例: "C_01_integrated,"）
+
+    Returns:
+        連結したCSV本文（各行末に "\\r\\n"、行がなければ空文字列）
+
+    Examples:
+        >>> join_csv_rows(["a,1", "b,2"], prefix="h,")
+        'h,a,1\\r\\nh,b,2\\r\\n'
+    """
+    if not rows:
+        return ""
+    return prefix + ("\r\n" + prefix).join(rows) + "\r\n"
+
+
+def write_csv_body(
+    file_path: Path,
+    header: Sequence[str],
+    body: str,
+    num_rows: int,
+    num_fields: int,
+) -> bool:
+    """整形済みのCSV本文をファイルにバイト列として書き出す
+
+    csv.writer を通さず、本文をまとめて UTF-8 に変換して1回で書き出す。
+    クォートが必要な値（カンマ・ダブルクォート・改行を含む値）が混ざっている
+    場合は、区切り文字の数が合わなくなるので何も書かずに False を返す。
+    その場合、呼び出し側で csv.writer による書き出しに切り替える。
+
+    Args:
+        file_path: 出力ファイルパス
+        header: ヘッダーの列名（クォート不要な値のみ）
+        body: join_csv_rows で連結したCSV本文
+        num_rows: 本文の行数
+        num_fields: 1行あたりの列数
+
+    Returns:
+        書き出した場合は True、クォートが必要で書き出さなかった場合は False
+    """
+    if (
+        body.count(",") != num_rows * (num_fields - 1)
+        or body.count("\n") != num_rows
+        or body.count("\r") != num_rows
+        or '"' in body
+    ):
+        return False
+
+    with open(file_path, "wb") as f:
+        f.write((",".join(header) + "\r\n").encode("utf-8"))
+        f.write(body.encode("utf-8"))
+
+    return True
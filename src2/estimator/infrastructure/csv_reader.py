@@ -1,15 +1,109 @@
 """検出ログCSV読み込み"""
 
-import csv
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
 from ..domain.detection_record import DetectionRecord
-from ...shared.utils.datetime_utils import parse_timestamp
+from ..domain.detection_records_array import DetectionRecordsArray
+
+# 文字列として読む列（ID類は数値や欠損値に変換させない）
+_STR_COLUMNS = {"Walker_ID": str, "Hashed_ID": str, "Detector_ID": str}
+
+
+def _read_log_frame(csv_file: Path) -> Optional[pd.DataFrame]:
+    """1つの検出ログCSVを DataFrame として読み込む
+
+    列の分割・型変換は pandas の C パーサーで一括に行う。
+
+    Args:
+        csv_file: 検出ログCSVファイルのパス
+
+    Returns:
+        検出ログの DataFrame（空ファイルの場合は None）
+    """
+    try:
+        return pd.read_csv(
+            csv_file,
+            encoding="utf-8",
+            dtype={**_STR_COLUMNS, "Sequence_Number": "int32"},
+            keep_default_na=False,
+        )
+    except pd.errors.EmptyDataError:
+        return None
+
+
+def _frame_to_array(df: pd.DataFrame) -> DetectionRecordsArray:
+    """検出ログの DataFrame を時刻順にソートした列指向の配列に変換
+
+    Args:
+        df: 検出ログの DataFrame（行はファイル順）
+
+    Returns:
+        DetectionRecordsArray（タイムスタンプ順、同時刻は元の行順）
+    """
+    # ミリ秒あり/なしの両形式に対応（parse_timestamp と同じ）
+    timestamps = pd.to_datetime(df["Timestamp"], format="ISO8601").to_numpy(
+        dtype="datetime64[us]"
+    )
+
+    # タイムスタンプ順にソート（安定ソートなので同時刻は元の行順を保つ）
+    order = np.argsort(timestamps, kind="stable")
+
+    # 検出器IDは小さな整数コードに変換（コード順 = 検出器IDの辞書順）
+    detector_codes, detector_ids = pd.factorize(df["Detector_ID"], sort=True)
+
+    return DetectionRecordsArray(
+        timestamps=timestamps[order],
+        walker_ids=df["Walker_ID"].to_numpy(dtype=object)[order],
+        hashed_ids=df["Hashed_ID"].to_numpy(dtype=object)[order],
+        detector_codes=detector_codes.astype(np.int16)[order],
+        sequence_numbers=df["Sequence_Number"].to_numpy()[order],
+        detector_ids=tuple(detector_ids.tolist()),
+    )
+
+
+def read_detector_logs_array(
+    detector_logs_dir: str = "src2_result/detector_logs",
+) -> DetectionRecordsArray:
+    """検出ログCSVファイルを読み込み、全レコードを列指向の配列として返す
+
+    全ファイルの行をファイル名順に連結し、タイムスタンプで1回だけ安定ソートする。
+    同時刻のレコードはファイル名順 → ファイル内の順序になる。
+
+    Args:
+        detector_logs_dir: 検出ログディレクトリのパス
+
+    Returns:
+        DetectionRecordsArray（タイムスタンプ順にソート済み）
+    """
+    logs_dir = Path(detector_logs_dir)
+
+    frames = [
+        df
+        for df in map(_read_log_frame, sorted(logs_dir.glob("*_log.csv")))
+        if df is not None
+    ]
+    if not frames:
+        return DetectionRecordsArray(
+            timestamps=np.empty(0, dtype="datetime64[us]"),
+            walker_ids=np.empty(0, dtype=object),
+            hashed_ids=np.empty(0, dtype=object),
+            detector_codes=np.empty(0, dtype=np.int16),
+            sequence_numbers=np.empty(0, dtype=np.int32),
+            detector_ids=(),
+        )
+
+    return _frame_to_array(pd.concat(frames, ignore_index=True))
 
 
 def read_detector_logs(detector_logs_dir: str = "src2_result/detector_logs") -> List[DetectionRecord]:
     """検出ログCSVファイルを読み込み、全レコードをリストとして返す
 
+    列指向で読み込み・ソートした後、DetectionRecord のリストに一括変換する。
+
     Args:
         detector_logs_dir: 検出ログディレクトリのパス
 
@@ -23,28 +117,7 @@ def read_detector_logs(detector_logs_dir: str = "src2_result/detector_logs") ->
         >>> isinstance(records[0], DetectionRecord)
         True
     """
-    all_records = []
-    logs_dir = Path(detector_logs_dir)
-
-    # 全CSVファイルを読み込む
-    for csv_file in sorted(logs_dir.glob("*_log.csv")):
-        with open(csv_file, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                record = DetectionRecord(
-                    timestamp=parse_timestamp(row["Timestamp"]),
-                    walker_id=row["Walker_ID"],
-                    hashed_id=row["Hashed_ID"],
-                    detector_id=row["Detector_ID"],
-                    sequence_number=int(row["Sequence_Number"]),
-                    is_judged=False,
-                )
-                all_records.append(record)
-
-    # タイムスタンプ順にソート
-    all_records.sort(key=lambda r: r.timestamp)
-
-    return all_records
+    return read_detector_logs_array(detector_logs_dir).to_records()
 
 
 def read_detector_log_by_detector(
@@ -64,27 +137,48 @@ def read_detector_log_by_detector(
         >>> all(r.detector_id == "A" for r in records)
         True
     """
-    records = []
     logs_dir = Path(detector_logs_dir)
     csv_file = logs_dir / f"{detector_id}_log.csv"
 
     if not csv_file.exists():
-        return records
-
-    with open(csv_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            record = DetectionRecord(
-                timestamp=parse_timestamp(row["Timestamp"]),
-                walker_id=row["Walker_ID"],
-                hashed_id=row["Hashed_ID"],
-                detector_id=row["Detector_ID"],
-                sequence_number=int(row["Sequence_Number"]),
-                is_judged=False,
-            )
-            records.append(record)
-
-    # タイムスタンプ順にソート
-    records.sort(key=lambda r: r.timestamp)
-
-    return records
+        return []
+
+    df = _read_log_frame(csv_file)
+    if df is None:
+        return []
+
+    return _frame_to_array(df).to_records()
+
+
+def read_detector_logs_by_detector(
+    detector_logs_dir: str = "src2_result/detector_logs",
+) -> Dict[str, List[DetectionRecord]]:
+    """全検出器の検出ログCSVファイルを1回ずつ読み込み、検出器IDごとに返す
+
+    検出器ごとに read_detector_log_by_detector を呼ぶ代わりに使う。
+    ディレクトリの走査は1回、各ファイルの読み込みも1回で済む。
+    検出器IDはファイル名（"<検出器ID>_log.csv"）から取る。
+
+    Args:
+        detector_logs_dir: 検出ログディレクトリのパス
+
+    Returns:
+        検出器ID -> 検出レコードリスト（タイムスタンプ順にソート済み）
+        （空ファイルの検出器は空リスト）
+
+    Examples:
+        >>> records_by_detector = read_detector_logs_by_detector("src2_result/detector_logs")
+        >>> all(r.detector_id == "A" for r in records_by_detector.get("A", []))
+        True
+    """
+    logs_dir = Path(detector_logs_dir)
+
+    records_by_detector: Dict[str, List[DetectionRecord]] = {}
+    for csv_file in sorted(logs_dir.glob("*_log.csv")):
+        detector_id = csv_file.name[: -len("_log.csv")]
+        df = _read_log_frame(csv_file)
+        records_by_detector[detector_id] = (
+            [] if df is None else _frame_to_array(df).to_records()
+        )
+
+    return records_by_detector
@@ -0,0 +1,30 @@
+"""出力ファイル名の生成ユーティリティ"""
+
+import functools
+
+# ファイル名安全化用の変換表（ASCIIの英数字以外を '_' に置換）
+_SAFE_HASH_TRANS = str.maketrans(
+    {ch: "_" for ch in map(chr, range(128)) if not ch.isalnum()}
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def safe_hash(integrated_hash: str) -> str:
+    """ハッシュ値をファイル名に使える形に変換（英数字以外は '_'）
+
+    同じハッシュはパスをまたいで何度も書き出されるため、結果をキャッシュする。
+
+    Args:
+        integrated_hash: 統合ハッシュ値
+
+    Returns:
+        ファイル名用の文字列
+
+    Examples:
+        >>> safe_hash("C_01-integrated")
+        'C_01_integrated'
+    """
+    # ASCIIのみのハッシュは変換表で一括置換し、それ以外は1文字ずつ判定する
+    if integrated_hash.isascii():
+        return integrated_hash.translate(_SAFE_HASH_TRANS)
+    return "".join(ch if ch.isalnum() else "_" for ch in integrated_hash)
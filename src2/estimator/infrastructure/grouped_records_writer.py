@@ -1,10 +1,105 @@
 """グループ化されたレコードのCSV出力"""
 
 import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from ..domain.detection_record import DetectionRecord
-from ...shared.utils.datetime_utils import format_timestamp
+from ...shared.utils.datetime_utils import format_timestamps
+from .csv_bytes import join_csv_rows, write_csv_body
+from .file_naming import safe_hash
+
+# ペイロードCSVのヘッダー
+_HEADER = (
+    "Integrated_Hash",
+    "Original_Hash",
+    "Timestamp",
+    "Walker_ID",
+    "Detector_ID",
+    "Sequence_Number",
+    "Is_Judged",
+)
+
+# CSV書き出し時のファイルバッファサイズ（1 MiB）
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def _write_records_csv(
+    file_path: Path,
+    groups: List[Tuple[str, List[DetectionRecord], List[str]]],
+) -> None:
+    """レコードをペイロードCSVの形式で1ファイルに書き出す
+
+    Args:
+        file_path: 出力ファイルパス
+        groups: (統合ハッシュ, レコードリスト, 文字列化済みタイムスタンプ) のリスト
+            （この順にファイルへ書き出す）
+    """
+    # 値はすべてクォート不要な想定なので、行を直接整形してバイト列で書き出す
+    # 統合ハッシュの列はグループ内で共通なので、行ごとには埋め込まず連結時に付ける
+    body = "".join(
+        join_csv_rows(
+            [
+                f"{record.hashed_id},{ts_str},{record.walker_id},"
+                f"{record.detector_id},{record.sequence_number},{record.is_judged}"
+                for record, ts_str in zip(records, ts_strs)
+            ],
+            prefix=f"{integrated_hash},",
+        )
+        for integrated_hash, records, ts_strs in groups
+    )
+    num_rows = sum(len(records) for _, records, _ in groups)
+    if not write_csv_body(file_path, _HEADER, body, num_rows, len(_HEADER)):
+        # クォートが必要な値が含まれる場合は csv.writer で書き出す
+        with open(
+            file_path, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+        ) as f:
+            writer = csv.writer(f)
+
+            # ヘッダー
+            writer.writerow(_HEADER)
+
+            # データ（行はジェネレータで渡し、writerows でまとめて書き出す）
+            writer.writerows(
+                (
+                    integrated_hash,
+                    record.hashed_id,  # 元のハッシュ値も記録
+                    ts_str,
+                    record.walker_id,
+                    record.detector_id,
+                    record.sequence_number,
+                    record.is_judged,
+                )
+                for integrated_hash, records, ts_strs in groups
+                for record, ts_str in zip(records, ts_strs)
+            )
+
+
+def _write_payload_file(
+    file_path: Path, integrated_hash: str, records: List[DetectionRecord]
+) -> Tuple[str, int, str, str]:
+    """1ハッシュ分のレコードをCSVに書き出し、index.csv 用の行を返す
+
+    Args:
+        file_path: 出力ファイルパス
+        integrated_hash: 統合ハッシュ値
+        records: このハッシュのレコードリスト
+
+    Returns:
+        (統合ハッシュ, レコード数, 最初の時刻, 最後の時刻)
+    """
+    # タイムスタンプは1ファイル分まとめて文字列化する
+    ts_strs = format_timestamps([record.timestamp for record in records])
+
+    _write_records_csv(file_path, [(integrated_hash, records, ts_strs)])
+
+    return (
+        integrated_hash,
+        len(records),
+        ts_strs[0],
+        ts_strs[-1],
+    )
 
 
 def export_grouped_records(
@@ -51,17 +146,20 @@ def export_grouped_records(
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # 既存ファイルを削除
+    # 既存ファイルを削除（ディレクトリの走査は1回だけ）
     if clean_before:
-        for pattern in ["payload_*.csv", "index.csv"]:
-            for file_path in output_path.glob(pattern):
-                try:
-                    file_path.unlink()
-                except OSError:
-                    pass
-
-    written_files: List[str] = []
-    index_rows: List[tuple] = []
+        with os.scandir(output_path) as entries:
+            for entry in entries:
+                name = entry.name
+                if (
+                    name.startswith("payload_") and name.endswith(".csv")
+                ) or name == "index.csv":
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+
+    tasks: List[Tuple[Path, str, List[DetectionRecord]]] = []
 
     # ペイロードごとにCSVファイルを作成
     for integrated_hash, records in grouped_records.items():
@@ -69,52 +167,25 @@ def export_grouped_records(
             continue
 
         # ファイル名安全化（英数字以外は '_'）
-        safe_hash = "".join(ch if ch.isalnum() else "_" for ch in integrated_hash)
-        filename = f"payload_{safe_hash}.csv"
-        file_path = output_path / filename
-
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-
-            # ヘッダー
-            writer.writerow(
-                [
-                    "Integrated_Hash",
-                    "Original_Hash",
-                    "Timestamp",
-                    "Walker_ID",
-                    "Detector_ID",
-                    "Sequence_Number",
-                    "Is_Judged",
-                ]
-            )
-
-            # データ
-            for record in records:
-                writer.writerow(
-                    [
-                        integrated_hash,
-                        record.hashed_id,  # 元のハッシュ値も記録
-                        format_timestamp(record.timestamp),
-                        record.walker_id,
-                        record.detector_id,
-                        record.sequence_number,
-                        record.is_judged,
-                    ]
-                )
-
-        written_files.append(str(file_path))
-
-        # インデックス用の情報を記録
-        first_ts = format_timestamp(records[0].timestamp)
-        last_ts = format_timestamp(records[-1].timestamp)
-        index_rows.append((integrated_hash, len(records), first_ts, last_ts))
+        filename = f"payload_{safe_hash(integrated_hash)}.csv"
+        tasks.append((output_path / filename, integrated_hash, records))
+
+    # ファイルごとの書き出しは独立しているため、スレッド並列で書き出す
+    # （安全化後のファイル名が衝突する場合は上書き順を保つため逐次実行）
+    written_files = [str(task[0]) for task in tasks]
+    if len(tasks) > 1 and len(set(written_files)) == len(written_files):
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            index_rows = list(executor.map(lambda t: _write_payload_file(*t), tasks))
+    else:
+        index_rows = [_write_payload_file(*task) for task in tasks]
 
     # インデックスファイルを出力
     index_file: Optional[str] = None
     if include_index:
         index_file = str(output_path / "index.csv")
-        with open(index_file, "w", newline="", encoding="utf-8") as f:
+        with open(
+            index_file, "w", newline="", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE
+        ) as f:
             writer = csv.writer(f)
             writer.writerow(
                 ["Integrated_Hash", "NumRecords", "FirstTimestamp", "LastTimestamp"]
@@ -126,3 +197,56 @@ def export_grouped_records(
         "written_files": written_files,
         "index_file": index_file,
     }
+
+
+def export_grouped_records_single_file(
+    grouped_records: Dict[str, List[DetectionRecord]],
+    output_file: str = "src2_result/grouped_records/all_records.csv",
+) -> Dict[str, any]:
+    """グループ化されたレコードを1つのCSVファイルにまとめて出力
+
+    export_grouped_records はハッシュごとにファイルを作るため、
+    ハッシュ数が多いと open/close のコストが支配的になる。
+    こちらは全ハッシュを1ファイルに書き出す（ファイルを開くのは1回だけ）。
+    列は payload_*.csv と同じで、Integrated_Hash 列でハッシュを区別できる。
+
+    Args:
+        grouped_records: ハッシュ値ごとのレコードリスト
+        output_file: 出力CSVファイルパス
+
+    Returns:
+        出力情報の辞書 {
+            "num_payloads": int,
+            "num_records": int,
+            "output_file": str
+        }
+
+    Examples:
+        >>> result = export_grouped_records_single_file(records, "test_output/all.csv")
+        >>> result["num_payloads"]
+        1
+    """
+    output_path = Path(output_file)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # ハッシュ順 → ハッシュ内のレコード順に並べる
+    groups = [(h, records) for h, records in grouped_records.items() if records]
+
+    # タイムスタンプは全レコード分まとめて文字列化し、ハッシュごとに切り分ける
+    all_ts_strs = format_timestamps(
+        [record.timestamp for _, records in groups for record in records]
+    )
+    sections = []
+    offset = 0
+    for integrated_hash, records in groups:
+        end = offset + len(records)
+        sections.append((integrated_hash, records, all_ts_strs[offset:end]))
+        offset = end
+
+    _write_records_csv(output_path, sections)
+
+    return {
+        "num_payloads": len(groups),
+        "num_records": len(all_ts_strs),
+        "output_file": str(output_path),
+    }
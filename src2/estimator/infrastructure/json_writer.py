@@ -1,12 +1,18 @@
 """推定結果JSON出力"""
 
 import json
+from itertools import chain
 from pathlib import Path
 from datetime import datetime
 from typing import List
 from ..domain.estimated_trajectory import EstimatedTrajectory
 from ...shared.utils.datetime_utils import format_timestamp
 
+try:
+    import orjson  # 利用可能なら高速なJSONシリアライザを使う
+except ImportError:
+    orjson = None
+
 
 def write_estimated_trajectories(
     trajectories: List[EstimatedTrajectory],
@@ -30,9 +36,7 @@ def write_estimated_trajectories(
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     # クラスタ数を計算
-    all_cluster_ids = set()
-    for traj in trajectories:
-        all_cluster_ids.update(traj.cluster_ids)
+    all_cluster_ids = set(chain.from_iterable(traj.cluster_ids for traj in trajectories))
 
     # JSON構造を構築
     output_data = {
@@ -63,5 +67,10 @@ def write_estimated_trajectories(
     }
 
     # JSONファイルに書き込み
+    # orjson があればエンコード済みのバイト列を1回で書き出す（中間の str を作らない）
+    if orjson is not None:
+        output_path.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        return
+
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(output_data, f, indent=2, ensure_ascii=False)
@@ -1,12 +1,19 @@
 """Estimator メインエントリーポイント"""
 
+import logging
+import sys
+
 from .infrastructure.csv_reader import read_detector_logs
 from .infrastructure.json_writer import write_estimated_trajectories
-from .infrastructure.grouped_records_writer import export_grouped_records
+from .infrastructure.grouped_records_writer import (
+    export_grouped_records,
+    export_grouped_records_single_file,
+)
 from .infrastructure.clustering_writer import export_clustering_results
 from .infrastructure.config_loader import load_clustering_config, load_estimator_settings
 from .usecase.group_by_payload import group_records_by_payload
 from .usecase.estimate_trajectories import estimate_trajectories
+from .usecase import clustering
 
 
 def main():
@@ -19,6 +26,11 @@ def main():
     est_settings = load_estimator_settings()
     print(f"✓ 読み込んだ検出器数: {len(config.detectors)}")
     print(f"✓ 歩行速度: {config.walker_speed} m/s, impossible_factor: {config.impossible_factor}")
+    if config.debug:
+        # クラスタリング過程の詳細ログを標準出力に出す（他の出力と同じ順序で表示）
+        logging.basicConfig(stream=sys.stdout, format="%(message)s")
+        clustering.logger.setLevel(logging.DEBUG)
+        print("✓ クラスタリングの詳細ログ: 有効")
 
     # 1. 検出ログCSVを読み込み
     print("\n[Phase 1] 検出ログCSVを読み込み中...")
@@ -33,11 +45,20 @@ def main():
 
     # 3. グループ化されたレコードをCSV出力
     print("\n[Phase 3] グループ化されたレコードをCSV出力中...")
-    export_result = export_grouped_records(grouped_records)
-    print(f"✓ 出力完了: {export_result['num_payloads']} ファイル")
-    print(f"  出力先: src2_result/grouped_records/")
-    if export_result["index_file"]:
-        print(f"  インデックス: {export_result['index_file']}")
+    if est_settings["grouped_records_single_file"]:
+        # 全ハッシュを1ファイルにまとめて出力
+        export_result = export_grouped_records_single_file(grouped_records)
+        print(
+            f"✓ 出力完了: {export_result['num_payloads']} ハッシュ, "
+            f"{export_result['num_records']} レコード"
+        )
+        print(f"  出力先: {export_result['output_file']}")
+    else:
+        export_result = export_grouped_records(grouped_records)
+        print(f"✓ 出力完了: {export_result['num_payloads']} ファイル")
+        print(f"  出力先: src2_result/grouped_records/")
+        if export_result["index_file"]:
+            print(f"  インデックス: {export_result['index_file']}")
 
     # 4. 軌跡推定（複数パスのクラスタリング）
     print("\n[Phase 4] 軌跡推定中...")
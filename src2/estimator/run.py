@@ -4,6 +4,8 @@
 既存のmain.pyは変更せず、このモジュールで引数による制御を提供する。
 """
 
+import os
+from contextlib import ExitStack, redirect_stdout
 from pathlib import Path
 from typing import List
 
@@ -52,24 +54,18 @@ def run_estimator(
         print(f"グループ数: {len(grouped_records)}")
 
     # 軌跡推定（複数パスクラスタリング）
-    # verbose=Falseの場合は標準出力を抑制
-    import sys
-    import io
-
-    if not verbose:
-        # 標準出力を一時的に抑制
-        old_stdout = sys.stdout
-        sys.stdout = io.StringIO()
+    # verbose=Falseの場合は標準出力を os.devnull に捨てる
+    # （StringIO に溜め込まないので、出力量に応じたメモリ確保が発生しない）
+    with ExitStack() as stack:
+        if not verbose:
+            devnull = stack.enter_context(open(os.devnull, "w", encoding="utf-8"))
+            stack.enter_context(redirect_stdout(devnull))
 
-    try:
         estimated_trajectories, _ = estimate_trajectories(
             grouped_records=grouped_records,
             max_passes=10,
             output_per_pass=False,  # バッチ実行時は中間出力しない
         )
-    finally:
-        if not verbose:
-            sys.stdout = old_stdout
 
     # 推定結果JSONを出力
     write_estimated_trajectories(
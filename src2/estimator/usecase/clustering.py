@@ -1,14 +1,77 @@
+import logging
+import math
+from bisect import bisect_left
+from itertools import islice
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
+
+import numpy as np
+
 from ..domain.detection_record import DetectionRecord
 from ..domain.estimated_stay import EstimatedStay
 from ..domain.estimated_trajectory import EstimatedTrajectory
 from ..domain.cluster_state import ClusterState
 from ..domain.clustering_config import ClusteringConfig
-from ..domain.record_action import RecordAction, ForwardSearchAction
-from ...shared.utils.distance_calculator import calculate_min_travel_time
+from ..domain.record_action import RecordAction
 from .clustering_utils import MAX_STAY_DURATION
 
+# クラスタリング過程の詳細ログ（滞在時間超過・ありえない移動・前方探索・クラスタ形成）
+# config.debug=True のときだけ出力する（False ならログの呼び出し自体を行わない）
+# 出力には logging の DEBUG レベルも必要（main.py は debug 設定に応じて有効にする）:
+#   logging.basicConfig()
+#   logging.getLogger("src2.estimator.usecase.clustering").setLevel(logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+# ハッシュごとの (レコードリスト, 時刻[μs], 検出器インデックス, 使用済みフラグ) のキャッシュ
+# 使用済みフラグはクラスタ確定のたびに records の is_judged と同じく更新される
+RecordArraysState = Dict[
+    str, Tuple[List[DetectionRecord], np.ndarray, np.ndarray, np.ndarray]
+]
+
+# ハッシュごとの (レコードリスト, 最初の未使用レコードになりうる位置) のキャッシュ
+JudgedCursorState = Dict[str, Tuple[List[DetectionRecord], int]]
+
+
+def _records_to_arrays(
+    records: List[DetectionRecord], detector_index: Dict[str, int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """レコードリストを列ごとの NumPy 配列に変換
+
+    時刻と検出器はレコードごとに変わらないので、ハッシュごとに1回だけ変換する。
+
+    Args:
+        records: レコードリスト
+        detector_index: 検出器ID -> インデックス
+
+    Returns:
+        (時刻[μs] の int64 配列, 検出器インデックスの配列)
+    """
+    ts_us = np.fromiter(
+        [r.timestamp_us for r in records], dtype=np.int64, count=len(records)
+    )
+    det_idx = np.array([detector_index[r.detector_id] for r in records], dtype=np.intp)
+    return ts_us, det_idx
+
+
+def _next_unjudged_index(records: List[DetectionRecord], start_idx: int) -> int:
+    """start_idx 以降で最初の未使用レコードのインデックスを返す
+
+    Args:
+        records: レコードリスト
+        start_idx: 探索開始インデックス
+
+    Returns:
+        最初の未使用レコードのインデックス（なければ len(records)）
+    """
+    return next(
+        (
+            idx
+            for idx, rec in enumerate(islice(records, start_idx, None), start_idx)
+            if not rec.is_judged
+        ),
+        len(records),
+    )
+
 
 def _judge_candidate_record(
     state: ClusterState,
@@ -43,44 +106,55 @@ def _judge_candidate_record(
     prev_record = state.prev_record
     prev_det_id = prev_record.detector_id
     cand_det_id = candidate_record.detector_id
-    current_detector = state.route_sequence[-1] if state.route_sequence else None
 
     # =========================================================================
     # 同じ検出器での滞在判定
     # =========================================================================
-    if cand_det_id == current_detector:
+    # 推定経路の末尾（現在の検出器）は常に直前のレコードの検出器と一致する
+    # （滞在継続は末尾と同じ検出器のレコードだけ、移動は末尾に検出器を追加する）
+    if cand_det_id == prev_det_id:
         if config.allow_long_stays:  # 長時間滞在を許可
             return RecordAction.ADD_AS_STAY
 
-        stay_time = (candidate_record.timestamp - prev_record.timestamp).total_seconds()
+        # 時刻差（秒）はマイクロ秒の整数差から求める（total_seconds() と同じ値）
+        stay_time = (candidate_record.timestamp_us - prev_record.timestamp_us) / 1e6
         if stay_time <= MAX_STAY_DURATION:
             return RecordAction.ADD_AS_STAY  # 滞在時間内
         else:
-            print(
-                f"[{state.cluster_id}] 滞在時間超過検出: "
-                f"{cand_det_id}での滞在時間={stay_time:.1f}s > 最大={MAX_STAY_DURATION:.1f}s "
-                f"→ 前方探索開始"
-            )
+            if config.debug:
+                logger.debug(
+                    "[%s] 滞在時間超過検出: %sでの滞在時間=%.1fs > 最大=%.1fs → 前方探索開始",
+                    state.cluster_id,
+                    cand_det_id,
+                    stay_time,
+                    MAX_STAY_DURATION,
+                )
             return RecordAction.FORWARD_SEARCH  # 滞在時間超過しているので前方探索
 
     # =========================================================================
     # 異なる検出器への移動判定
     # =========================================================================
     else:
-        move_time = (candidate_record.timestamp - prev_record.timestamp).total_seconds()
-        min_travel_time = calculate_min_travel_time(
-            config.detectors[prev_det_id],  # 検知器のIDを指定してその検知器の情報を取得
-            config.detectors[cand_det_id],
-            config.walker_speed,
-        )
+        move_time = (candidate_record.timestamp_us - prev_record.timestamp_us) / 1e6
+        # 検出器ペアの判定閾値（最小移動時間 × impossible_factor）は
+        # 設定の初期化時に計算済み
+        detector_index = config.detector_index
+        prev_idx = detector_index[prev_det_id]
+        cand_idx = detector_index[cand_det_id]
 
         # ありえない移動かの判定。impossible_factorによって誤差を考慮
-        if move_time < min_travel_time * config.impossible_factor:
-            print(
-                f"[{state.cluster_id}] ありえない移動検出: "
-                f"{prev_det_id}→{cand_det_id} "
-                f"(移動時間={move_time:.1f}s < 最小移動時間{min_travel_time:.1f}s×{config.impossible_factor}"
-            )
+        if move_time < config.impossible_threshold_matrix[prev_idx][cand_idx]:
+            if config.debug:
+                min_travel_time = config.min_travel_matrix[prev_idx][cand_idx]
+                logger.debug(
+                    "[%s] ありえない移動検出: %s→%s (移動時間=%.1fs < 最小移動時間%.1fs×%s",
+                    state.cluster_id,
+                    prev_det_id,
+                    cand_det_id,
+                    move_time,
+                    min_travel_time,
+                    config.impossible_factor,
+                )
             return RecordAction.FORWARD_SEARCH
         else:
             # 正常な移動 → cluster_recordsにレコードを追加、推定経路にも検出器IDを追加
@@ -92,6 +166,8 @@ def _forward_search(
     records: List[DetectionRecord],  # ハッシュ内のすべてのレコード
     start_idx: int,
     config: ClusteringConfig,
+    arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    cluster_indices: List[int],
 ) -> Optional[int]:
     """前方探索: 到達可能なレコードを探す
 
@@ -115,112 +191,174 @@ def _forward_search(
     「滞在の継続」としてcluster_recordsにレコードを追加しつつ探索を継続する。
     これにより、prev_record が更新され、後続の到達可能性判定が正確になる。
 
+    【判定の一括化】
+    判定は配列とインデックスだけを扱う _forward_search_kernel で行い、
+    ここでは結果のインデックスからレコードを追加する。
+    使用済み・検出器による絞り込みは探索範囲全体を NumPy 配列でまとめて行い、
+    候補のレコードだけを判定する。時刻順なので、滞在継続の候補は次の1件、
+    到達可能性は次の滞在継続の候補より手前の範囲だけをまとめて判定すればよい。
+
     Args:
         state: 現在のクラスタ状態（探索中に更新される）
         records: レコードリスト
         start_idx: 探索開始インデックス
         config: クラスタリング設定
+        arrays: records と同じ順序の (時刻[μs], 検出器インデックス, 使用済みフラグ)
+        cluster_indices: クラスタに追加したレコードのインデックス（滞在継続の分を追記）
 
     Returns:
         到達可能なレコードのインデックス、見つからなければ None
     """
 
-    def judge_scan_record(scan_record: DetectionRecord) -> ForwardSearchAction:
-        """スキャン中のレコードを判定し、そのレコードに対する操作を返す
-
-        分岐構造:
-        - 使用済み → SKIP
-        - 1分岐目: 現在の検出器と同じ → 滞在継続判定
-        - 2分岐目: 過去に訪れた検出器 → SKIP（ループ回避）
-        - 3分岐目: 新しい検出器 → 到達可能性判定
-        """
-        # 使用済みチェック
-        if scan_record.is_judged:
-            return ForwardSearchAction.SKIP
-
-        prev_record = state.prev_record
-        prev_det_id = prev_record.detector_id
-        current_sequence_detector = (
-            state.route_sequence[-1] if state.route_sequence else None
-        )
-        scan_det_id = scan_record.detector_id
-
-        # =================================================================
-        # 1分岐目: 現在の検出器と同じ → 滞在継続判定
-        # =================================================================
-        if scan_det_id == current_sequence_detector:
-            if config.allow_long_stays:
-                return ForwardSearchAction.ADD_AND_CONTINUE
-            else:
-                stay_time_diff = (
-                    scan_record.timestamp - prev_record.timestamp
-                ).total_seconds()
-                if stay_time_diff <= MAX_STAY_DURATION:
-                    return ForwardSearchAction.ADD_AND_CONTINUE  # 滞在時間内
-                else:
-                    return ForwardSearchAction.SKIP  # 滞在時間超過
-
-        # =================================================================
-        # 2分岐目: 過去に訪れた検出器 → SKIP（ループ回避）
-        # =================================================================
-        elif scan_det_id in state.route_sequence:
-            return ForwardSearchAction.SKIP
-
-        # =================================================================
-        # 3分岐目: 新しい検出器 → 到達可能性判定
-        # =================================================================
-        else:
-            scan_time_diff = (
-                scan_record.timestamp - prev_record.timestamp
-            ).total_seconds()
-            min_travel_time = calculate_min_travel_time(
-                config.detectors[prev_det_id],
-                config.detectors[scan_det_id],
-                config.walker_speed,
-            )
+    ts_us, det_idx, judged = arrays
+    detector_index = config.detector_index
 
-            # ありえない移動チェック
-            if scan_time_diff < min_travel_time * config.impossible_factor:
-                return ForwardSearchAction.SKIP
-            else:
-                # 到達可能なレコード発見
-                return ForwardSearchAction.FOUND
+    # 前方探索中は推定経路が変わらない（滞在継続では経路に追加しない）ので、
+    # 検出器に関する判定は探索開始時に1回だけ行えばよい
+    current_det_idx = (
+        detector_index[state.route_sequence[-1]] if state.route_sequence else -1
+    )
+    in_route = np.zeros(len(detector_index), dtype=bool)
+    in_route[[detector_index[d] for d in state.route_set]] = True
+    thresholds = config.impossible_threshold_array[
+        detector_index[state.prev_record.detector_id]
+    ]
+
+    stay_indices, found_idx = _forward_search_kernel(
+        ts_us,
+        det_idx,
+        judged,
+        start_idx,
+        state.prev_record.timestamp_us,
+        current_det_idx,
+        in_route,
+        thresholds,
+        config.allow_long_stays,
+        MAX_STAY_DURATION,
+    )
 
-    scan_idx = start_idx
+    # 同じ検出器での滞在継続
+    # → cluster_recordsにレコードを追加（推定経路は更新されない）
+    for stay_idx in stay_indices:
+        state.add_record(records[stay_idx], add_to_route=False)
+    cluster_indices.extend(stay_indices)
+
+    if found_idx < 0:
+        # リストの最後まで探索したが、到達可能なレコードが見つからなかった
+        # → このクラスタは終了
+        if config.debug:
+            logger.debug("[%s] 到達可能レコードなし、クラスタ終了", state.cluster_id)
+        return None
 
-    # 最後のレコードまでスキャン
-    while scan_idx < len(records):
-        scan_record = records[scan_idx]
+    # 到達可能なレコード発見！
+    if config.debug:
+        logger.debug(
+            "[%s] 到達可能レコード発見: %s→%s (idx %s→%sまでスキップ)",
+            state.cluster_id,
+            state.prev_record.detector_id,
+            records[found_idx].detector_id,
+            start_idx,
+            found_idx,
+        )
+    return found_idx
 
-        # レコードを判定
-        action = judge_scan_record(scan_record)
 
-        if action == ForwardSearchAction.SKIP:
-            # このレコードをスキップして次へ。レコードは追加しないし、推定経路も更新しない
-            scan_idx += 1
-            continue
+def _forward_search_kernel(
+    ts_us: np.ndarray,
+    det_idx: np.ndarray,
+    judged: np.ndarray,
+    start_idx: int,
+    prev_us: int,
+    current_det_idx: int,
+    in_route: np.ndarray,
+    thresholds: np.ndarray,
+    allow_long_stays: bool,
+    max_stay_duration: float,
+) -> Tuple[List[int], int]:
+    """前方探索の本体（レコードオブジェクトを使わず、配列とインデックスだけで判定）
 
-        if action == ForwardSearchAction.ADD_AND_CONTINUE:
-            # 同じ検出器での滞在継続
-            # → cluster_recordsにレコードを追加して、次の検出器を探し続ける
-            # 推定経路は更新されない
-            state.add_record(scan_record, add_to_route=False)
-            scan_idx += 1
-            continue
+    Args:
+        ts_us: 各レコードの時刻（エポックからのマイクロ秒）
+        det_idx: 各レコードの検出器インデックス
+        judged: 各レコードの使用済みフラグ
+        start_idx: 探索開始インデックス
+        prev_us: 直前に追加したレコードの時刻（マイクロ秒）
+        current_det_idx: 現在の検出器のインデックス（推定経路の末尾、なければ -1）
+        in_route: 検出器インデックス -> 推定経路に含まれるか
+        thresholds: 検出器インデックス -> ありえない移動と判定する時間差の下限（秒）
+            （現在の検出器からの最小移動時間 × impossible_factor）
+        allow_long_stays: 長時間滞在を許可するか
+        max_stay_duration: 最大滞在時間（秒）
+
+    Returns:
+        (滞在継続として追加するレコードのインデックス（順番どおり）,
+         到達可能なレコードのインデックス（見つからなければ -1）)
+    """
+    num_records = len(ts_us)
+    scan_det = det_idx[start_idx:]
+    unjudged = ~judged[start_idx:]
+
+    # 1分岐目の対象: 現在の検出器と同じ未使用レコード（滞在継続の候補）
+    stay_positions = np.flatnonzero(unjudged & (scan_det == current_det_idx)) + start_idx
+    stay_ts = ts_us[stay_positions].tolist()
+    stay_positions = stay_positions.tolist()
+
+    # 3分岐目の対象: 推定経路にない検出器の未使用レコード（到達可能性判定の候補）
+    # （2分岐目: 推定経路にある検出器は SKIP なので候補に含めない）
+    move_positions = np.flatnonzero(unjudged & ~in_route[scan_det]) + start_idx
+    move_ts = ts_us[move_positions]
+    move_thresholds = thresholds[det_idx[move_positions]]
+    move_position_list = move_positions.tolist()
+
+    # 候補の中で最大の閾値より離れていれば、検出器によらず必ず到達可能
+    # （浮動小数点の丸めに影響されないよう 1μs の余裕を持たせる）
+    # 時刻順なので、その最初の候補より後ろは判定しなくてよい
+    reach_margin_us = (
+        math.ceil(float(move_thresholds.max()) * 1e6) + 1 if len(move_ts) else 0
+    )
 
-        if action == ForwardSearchAction.FOUND:
-            # 到達可能なレコード発見！
-            print(
-                f"[{state.cluster_id}] 到達可能レコード発見: "
-                f"{state.prev_record.detector_id}→{scan_record.detector_id} "
-                f"(idx {start_idx}→{scan_idx}までスキップ)"
+    stay_indices: List[int] = []
+    move_ptr = 0  # 次の到達可能性判定候補（move_positions の位置）
+
+    # 最後のレコードまでスキャン
+    for stay_ptr in range(len(stay_positions) + 1):
+        # 滞在継続の候補は次の1件だけ見ればよい
+        # （時刻順なので、それが滞在時間超過なら以降の同じ検出器も全て超過）
+        # 経過時間（秒）は total_seconds() と同じくマイクロ秒の整数差を 1e6 で割る
+        stay_idx = num_records
+        if stay_ptr < len(stay_positions):
+            if (
+                allow_long_stays
+                or (stay_ts[stay_ptr] - prev_us) / 1e6 <= max_stay_duration
+            ):
+                stay_idx = stay_positions[stay_ptr]
+
+        # 滞在継続の候補より手前にある、到達可能な最初のレコードを探す
+        move_end = bisect_left(move_position_list, stay_idx, move_ptr)
+        # 範囲内はレコードごとに分岐せず、真偽値配列の演算でまとめて判定する
+        # （使用済み・推定経路内の検出器は候補の抽出時に除外済み）
+        if move_ptr < move_end:
+            # 必ず到達可能な最初の候補までに範囲を絞る（二分探索）
+            # その候補が範囲内なら、ここで必ず到達可能なレコードが見つかる
+            move_stop = min(
+                move_end,
+                int(np.searchsorted(move_ts, prev_us + reach_margin_us)) + 1,
             )
-            return scan_idx
+            time_diff = (move_ts[move_ptr:move_stop] - prev_us) / 1e6
+            impossible = time_diff < move_thresholds[move_ptr:move_stop]
+            first_accept = int(impossible.argmin())
+            if not impossible[first_accept]:
+                return stay_indices, move_position_list[move_ptr + first_accept]
+        move_ptr = move_end
+
+        if stay_idx == num_records:
+            break
 
-    # リストの最後まで探索したが、到達可能なレコードが見つからなかった
-    # → このクラスタは終了
-    print(f"[{state.cluster_id}] 到達可能レコードなし、クラスタ終了")
-    return None
+        # 滞在継続: 直前のレコードが変わる
+        stay_indices.append(stay_idx)
+        prev_us = stay_ts[stay_ptr]
+
+    return stay_indices, -1
 
 
 # =============================================================================
@@ -232,7 +370,10 @@ def _extract_one_cluster(
     records: List[DetectionRecord],
     cluster_id: str,
     config: ClusteringConfig,
-) -> Optional[Tuple[List[DetectionRecord], List[str]]]:
+    static_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+    start_idx: int = 0,
+    judged: Optional[np.ndarray] = None,
+) -> Optional[Tuple[List[DetectionRecord], List[str], Dict[str, list]]]:
     """1つのハッシュグループから1つのクラスタを抽出
 
     レコードリストを時系列順に走査し、物理的に可能な移動を追跡して
@@ -247,7 +388,7 @@ def _extract_one_cluster(
        - ADD_AS_STAY → cluster_recordsにレコードを追加（推定経路には追加しない）
        - ADD_AS_MOVE → cluster_recordsにレコードを追加、推定経路にも検出器IDを追加
        - FORWARD_SEARCH → 前方探索で到達可能なレコードを探す
-    4. cluster_recordsと推定経路を返す
+    4. cluster_records・推定経路・滞在の集計を返す
 
     【重要】
     この関数は1つのクラスタのみを抽出する。
@@ -258,17 +399,19 @@ def _extract_one_cluster(
         records: レコードリスト（時系列順）
         cluster_id: 作成するクラスタのID
         config: クラスタリング設定
+        static_arrays: _records_to_arrays(records) の結果（省略時は必要になった時点で変換）
+        start_idx: 未使用レコードを探し始める位置（これより前は全て使用済みであること）
+        judged: records と同じ順序の使用済みフラグ（クラスタ確定時にこの配列も更新する。
+            省略時は前方探索が必要になった時点で records から作る）
 
     Returns:
-        (cluster_records, route_sequence) または None（未使用レコードがない場合）
+        (cluster_records, route_sequence, stay_stats) または None（未使用レコードがない場合）
     """
     # =========================================================================
     # 最初の未使用レコードを探す
     # =========================================================================
-    start_idx = 0
     # 使用済みレコードをスキップし、最初の未使用レコードを見つける
-    while start_idx < len(records) and records[start_idx].is_judged:
-        start_idx += 1
+    start_idx = _next_unjudged_index(records, start_idx)
 
     # 未使用レコードがない場合は None を返す
     if start_idx >= len(records):
@@ -286,16 +429,30 @@ def _extract_one_cluster(
     )
     # 最初のレコードを追加（推定経路にも検出器IDを追加）
     state.add_record(first_record, add_to_route=True)
+    # クラスタに追加したレコードのインデックス（使用済みフラグの更新用）
+    cluster_indices = [start_idx]
 
     # =========================================================================
     # メインループ: レコードを順に評価
     # =========================================================================
+    # 前方探索用の配列（前方探索が必要になった時点で作る）
+    arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    allow_long_stays = config.allow_long_stays
+
     idx = start_idx + 1
     while idx < len(records):
         candidate = records[idx]
 
-        # 使用済みはスキップ
+        # 使用済みはスキップ（連続する使用済みレコードをまとめて飛ばす）
         if candidate.is_judged:
+            idx = _next_unjudged_index(records, idx + 1)
+            continue
+
+        # 長時間滞在を許可する場合、同じ検出器のレコードは判定するまでもなく滞在継続
+        # （推定経路の末尾 = 直前のレコードの検出器）
+        if allow_long_stays and candidate.detector_id == state.prev_record.detector_id:
+            state.add_record(candidate, add_to_route=False)
+            cluster_indices.append(idx)
             idx += 1
             continue
 
@@ -305,26 +462,44 @@ def _extract_one_cluster(
         if action == RecordAction.ADD_AS_STAY:
             # 滞在継続: cluster_recordsにレコードを追加（推定経路には追加しない）
             state.add_record(candidate, add_to_route=False)
+            cluster_indices.append(idx)
             idx += 1
 
         elif action == RecordAction.ADD_AS_MOVE:
             # 移動: cluster_recordsにレコードを追加、推定経路にも検出器IDを追加
             state.add_record(candidate, add_to_route=True)
+            cluster_indices.append(idx)
             idx += 1
 
         elif action == RecordAction.FORWARD_SEARCH:
             # 前方探索を実行
-            found_idx = _forward_search(state, records, idx, config)
+            if arrays is None:
+                if static_arrays is None:
+                    static_arrays = _records_to_arrays(records, config.detector_index)
+                # 使用済みフラグはクラスタ確定時にしか変わらないので、
+                # 渡されていなければ抽出ごとに1回作る
+                if judged is None:
+                    judged = np.array([r.is_judged for r in records], dtype=bool)
+                arrays = (*static_arrays, judged)
+            found_idx = _forward_search(
+                state, records, idx, config, arrays, cluster_indices
+            )
             if found_idx is not None:
                 # 到達可能なレコードを採用（新検出器への移動なので推定経路にも追加）
                 found_record = records[found_idx]
                 state.add_record(found_record, add_to_route=True)
+                cluster_indices.append(found_idx)
                 idx = found_idx + 1
             else:
                 # 到達可能なレコードなし → クラスタ終了
                 break
 
-    return state.cluster_records, state.route_sequence
+    # クラスタ確定: 所属レコードをまとめて使用済みにする
+    state.mark_records()
+    if judged is not None:
+        judged[cluster_indices] = True
+
+    return state.cluster_records, state.route_sequence, state.stay_stats
 
 
 # =============================================================================
@@ -337,6 +512,8 @@ def run_single_clustering_pass(
     config: ClusteringConfig,
     cluster_counter_state: Optional[Dict[str, int]] = None,
     trajectory_id_offset: int = 0,
+    record_arrays_state: Optional[RecordArraysState] = None,
+    judged_cursor_state: Optional[JudgedCursorState] = None,
 ) -> Tuple[List[EstimatedTrajectory], Dict[str, List[DetectionRecord]], Dict[str, int]]:
     """レコードをクラスタリングして軌跡を形成
 
@@ -375,6 +552,11 @@ def run_single_clustering_pass(
         config: クラスタリング設定（設定ファイルから load_clustering_config() で取得）
         cluster_counter_state: クラスタカウンターの状態（パス間で永続化）
         trajectory_id_offset: 軌跡IDのオフセット（パス間で累積、重複ID防止用）
+        record_arrays_state: ハッシュごとの配列変換結果のキャッシュ（パス間で共有、
+            呼び出し側が空の辞書を渡すと、変換は各ハッシュにつき1回で済む）
+        judged_cursor_state: ハッシュごとの未使用レコードの探索開始位置（パス間で共有、
+            呼び出し側が空の辞書を渡すと、前のパスで使用済みになった先頭部分を
+            読み直さずに済む）
 
     Returns:
         (推定軌跡リスト, 更新されたグループ化レコード, 更新されたクラスタカウンター)
@@ -384,14 +566,12 @@ def run_single_clustering_pass(
     estimated_trajectories: List[EstimatedTrajectory] = []
 
     # クラスタカウンターの初期化（パス間で永続化）
-    if cluster_counter_state is None:
-        cluster_counter = defaultdict(int)
-    else:
-        cluster_counter = (
-            cluster_counter_state
-            if isinstance(cluster_counter_state, defaultdict)
-            else defaultdict(int, cluster_counter_state)
-        )
+    # defaultdict が渡されたらそのまま使い、同じオブジェクトを返す
+    cluster_counter = (
+        cluster_counter_state
+        if isinstance(cluster_counter_state, defaultdict)
+        else defaultdict(int, cluster_counter_state or {})
+    )
 
     # =========================================================================
     # ハッシュ値ごとに処理
@@ -400,35 +580,73 @@ def run_single_clustering_pass(
         if not records:
             continue
 
-        # クラスタIDを生成（例: "C_01_integrated_cluster1"）
+        # クラスタカウンターは未使用レコードの有無によらず進める
         cluster_counter[integrated_hash] += 1
+
+        # 最初の未使用レコードを探す（前のパスで使用済みになった先頭部分は飛ばす）
+        start_idx = 0
+        if judged_cursor_state is not None:
+            cursor = judged_cursor_state.get(integrated_hash)
+            if cursor is not None and cursor[0] is records:
+                start_idx = cursor[1]
+        start_idx = _next_unjudged_index(records, start_idx)
+        if judged_cursor_state is not None:
+            # 抽出するクラスタの先頭レコードは必ず使用済みになる
+            judged_cursor_state[integrated_hash] = (records, start_idx + 1)
+
+        # 未使用レコードが残っていないグループは、クラスタIDも配列も作らない
+        if start_idx >= len(records):
+            continue
+
+        # クラスタIDを生成（例: "C_01_integrated_cluster1"）
         cluster_id = f"{integrated_hash}_cluster{cluster_counter[integrated_hash]}"
 
+        # 配列変換のキャッシュ（同じレコードリストの場合のみ再利用）
+        static_arrays = None
+        judged = None
+        if record_arrays_state is not None:
+            cached = record_arrays_state.get(integrated_hash)
+            if cached is None or cached[0] is not records:
+                cached = (
+                    records,
+                    *_records_to_arrays(records, config.detector_index),
+                    np.array([r.is_judged for r in records], dtype=bool),
+                )
+                record_arrays_state[integrated_hash] = cached
+            static_arrays = cached[1:3]
+            judged = cached[3]
+
         # 1つのクラスタを抽出
-        result = _extract_one_cluster(records, cluster_id, config)
+        result = _extract_one_cluster(
+            records, cluster_id, config, static_arrays, start_idx, judged
+        )
         if result is None:
             continue
 
-        cluster_recs, route_sequence = result
+        cluster_recs, route_sequence, stay_stats = result
 
         # クラスタが有効なら（2つ以上の検出器を訪問）、軌跡として保存
         # 1つの検出器のみの場合は「移動」とみなさない
         if len(route_sequence) >= 2:
-            stays = _create_estimated_stays(cluster_recs)
+            stays = _create_estimated_stays(stay_stats)
+            # 経路文字列は一度だけ生成し、軌跡とログ出力で共有する
+            route = "".join(route_sequence)
 
             trajectory = EstimatedTrajectory(
                 trajectory_id=f"est_traj_{trajectory_id_offset + len(estimated_trajectories) + 1}",
                 cluster_ids=[cluster_id],
-                route="".join(route_sequence),
+                route=route,
                 stays=stays,
             )
             estimated_trajectories.append(trajectory)
 
-            print(
-                f"[{cluster_id}] クラスタ形成: "
-                f"推定経路={''.join(route_sequence)}, "
-                f"レコード数={len(cluster_recs)}"
-            )
+            if config.debug:
+                logger.debug(
+                    "[%s] クラスタ形成: 推定経路=%s, レコード数=%s",
+                    cluster_id,
+                    route,
+                    len(cluster_recs),
+                )
 
     return estimated_trajectories, grouped_records, cluster_counter
 
@@ -439,51 +657,33 @@ def run_single_clustering_pass(
 
 
 def _create_estimated_stays(
-    cluster_records: List[DetectionRecord],
+    stay_stats: Dict[str, list],
 ) -> List[EstimatedStay]:
-    """クラスタのレコードからEstimatedStayリストを作成
+    """クラスタの滞在集計からEstimatedStayリストを作成
 
-    クラスタに属するレコードを検出器ごとにグループ化し、
-    各検出器での滞在情報を算出する。
-
-    【処理の流れ】
-    1. レコードを検出器IDでグループ化
-    2. 各検出器の最初の検出時刻でソート
-    3. 各検出器について EstimatedStay を作成
+    クラスタリング中に ClusterState.add_record で検出器ごとに集計した
+    最初・最後の検出時刻と検出回数から、各検出器での滞在情報を作る。
+    集計はレコードの追加順（時系列順）に行われているので、並べ替えは不要
+    （最初に現れた順 = 最初の検出時刻順）。
 
     Args:
-        cluster_records: クラスタのレコードリスト
+        stay_stats: 検出器ID -> [最初の検出時刻, 最後の検出時刻, 検出回数]
 
     Returns:
         EstimatedStayのリスト（検出順）
     """
-    # 検出器ごとにグループ化
-    records_by_detector: Dict[str, List[DetectionRecord]] = defaultdict(list)
-    for rec in cluster_records:
-        records_by_detector[rec.detector_id].append(rec)
-
-    # 検出順にソート（各検出器の最初の検出時刻順）
-    detector_order = sorted(
-        records_by_detector.keys(),
-        key=lambda d: min(r.timestamp for r in records_by_detector[d]),
-    )
-
     stays: List[EstimatedStay] = []
-    for detector_id in detector_order:
-        det_records = sorted(
-            records_by_detector[detector_id], key=lambda r: r.timestamp
-        )
-        first_detection = det_records[0].timestamp
-        last_detection = det_records[-1].timestamp
-        duration = (last_detection - first_detection).total_seconds()
-
+    for detector_id, stat in stay_stats.items():
+        first_detection, last_detection, count = stat
         stays.append(
             EstimatedStay(
                 detector_id=detector_id,
                 first_detection=first_detection,
                 last_detection=last_detection,
-                estimated_duration_seconds=duration,
-                num_detections=len(det_records),
+                estimated_duration_seconds=(
+                    last_detection - first_detection
+                ).total_seconds(),
+                num_detections=count,
             )
         )
 
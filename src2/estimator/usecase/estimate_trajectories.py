@@ -57,6 +57,8 @@ def estimate_trajectories(
     pass_num = 1
     cluster_counter_state = defaultdict(int)  # クラスタカウンターの状態をパス間で共有
     trajectory_id_offset = 0  # 軌跡IDオフセット（パス間で累積、重複ID防止用）
+    record_arrays_state = {}  # ハッシュごとの配列変換結果をパス間で共有
+    judged_cursor_state = {}  # ハッシュごとの未使用レコードの探索開始位置をパス間で共有
 
     print(f"\n{'=' * 60}")
     print(f"複数パスクラスタリング開始（最大{max_passes}パス、新規判定0で終了）")
@@ -82,6 +84,8 @@ def estimate_trajectories(
                 config=config,
                 cluster_counter_state=cluster_counter_state,
                 trajectory_id_offset=trajectory_id_offset,
+                record_arrays_state=record_arrays_state,
+                judged_cursor_state=judged_cursor_state,
             )
         )
 
@@ -1,6 +1,7 @@
 """ペイロードごとのレコードグルーピングと類似ハッシュ統合"""
 
 from collections import defaultdict
+from operator import attrgetter
 from typing import Dict, List
 from ..domain.detection_record import DetectionRecord
 
@@ -91,6 +92,6 @@ def group_records_by_payload(
 
     # 各グループ内でタイムスタンプ順にソート
     for hashed_id in grouped_records:
-        grouped_records[hashed_id].sort(key=lambda r: r.timestamp)
+        grouped_records[hashed_id].sort(key=attrgetter("timestamp"))
 
     return dict(grouped_records)
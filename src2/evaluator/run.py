@@ -10,8 +10,10 @@
 
 import csv
 from pathlib import Path
+from typing import Dict, List
 
 from .domain.evaluation import EvaluationResult
+from .domain.trajectory import GroundTruthTrajectory, EstimatedTrajectory
 from .domain.pairwise import PairwiseMovementResult
 from .usecase.evaluate_trajectories import evaluate_trajectories, EvaluationConfig
 from .usecase.pairwise_movement import calculate_pairwise_movements
@@ -110,6 +112,60 @@ def run_evaluator(
     gt_trajectories = load_ground_truth_trajectories(ground_truth_path)
     est_trajectories = load_estimated_trajectories(estimated_path)
 
+    return _evaluate_and_save(
+        gt_trajectories,
+        est_trajectories,
+        ground_truth_path=ground_truth_path,
+        estimated_path=estimated_path,
+        output_path=output_path,
+        time_bin_minutes=time_bin_minutes,
+    )
+
+
+def run_evaluator_for_bins(
+    ground_truth_path: str,
+    estimated_path: str,
+    output_paths: Dict[int, str],
+) -> Dict[int, EvaluationResult]:
+    """複数の時間ビン幅でまとめて評価するEvaluator
+
+    GT・推定結果のJSONは1回だけ読み込み、読み込んだ軌跡を
+    各時間ビン幅の評価で使い回す。
+
+    Args:
+        ground_truth_path: Ground Truth JSONファイルパス
+        estimated_path: 推定結果JSONファイルパス
+        output_paths: 時間ビン幅（分） -> 評価結果JSONの出力パス
+
+    Returns:
+        時間ビン幅（分） -> EvaluationResult の辞書（output_pathsの順）
+    """
+    # データ読み込み（全ビンで共有）
+    gt_trajectories = load_ground_truth_trajectories(ground_truth_path)
+    est_trajectories = load_estimated_trajectories(estimated_path)
+
+    return {
+        time_bin_minutes: _evaluate_and_save(
+            gt_trajectories,
+            est_trajectories,
+            ground_truth_path=ground_truth_path,
+            estimated_path=estimated_path,
+            output_path=output_path,
+            time_bin_minutes=time_bin_minutes,
+        )
+        for time_bin_minutes, output_path in output_paths.items()
+    }
+
+
+def _evaluate_and_save(
+    gt_trajectories: List[GroundTruthTrajectory],
+    est_trajectories: List[EstimatedTrajectory],
+    ground_truth_path: str,
+    estimated_path: str,
+    output_path: str,
+    time_bin_minutes: int,
+) -> EvaluationResult:
+    """読み込み済みの軌跡を1つの時間ビン幅で評価し、結果を保存する"""
     # 評価実行
     config = EvaluationConfig(time_bin_minutes=time_bin_minutes)
     result = evaluate_trajectories(
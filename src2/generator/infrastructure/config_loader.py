@@ -1,12 +1,50 @@
 """設定ファイル読み込みモジュール"""
 
+import copy
+import functools
 import json
+import os
 import re
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 from ...shared.domain.detector import Detector
 from ..domain.payload_config import PayloadDefinitionsDict
 
+# 行コメント (//) とブロックコメント (/* */) を1回の走査で削除する
+_COMMENT_RE = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+try:
+    import orjson  # 利用可能なら高速なJSONパーサを使う
+except ImportError:
+    orjson = None
+
+
+def _parse_json(content: str) -> Dict[str, Any]:
+    """JSON文字列をパースする（orjson があれば orjson を使う）
+
+    orjson が受け付けない入力（NaN など）は標準の json で読み直す。
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_jsonc_cached(abs_path: str, mtime: float) -> Dict[str, Any]:
+    """JSONCファイルをパースする（キャッシュ用、mtime はキーとしてのみ使用）"""
+    with open(abs_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    # コメントを除去（コメントを含まないファイルは正規表現による置換を省略する）
+    if "//" in content or "/*" in content:
+        content = _COMMENT_RE.sub("", content)
+
+    # JSONとしてパース
+    return _parse_json(content)
+
 
 def load_jsonc(file_path: str) -> Dict[str, Any]:
     """JSONCファイルを読み込む
@@ -15,23 +53,14 @@ def load_jsonc(file_path: str) -> Dict[str, Any]:
         file_path: JSONCファイルのパス
 
     Returns:
-        パースされた辞書
-    """
-    with open(file_path, "r", encoding="utf-8") as f:
-        content = f.read()
+        パースされた辞書（呼び出し側が変更してもキャッシュに影響しないコピー）
 
-    def remove_jsonc_comments(text: str) -> str:
-        # 行コメント (//) を削除
-        text = re.sub(r"//.*", "", text)
-        # ブロックコメント (/* */) を削除
-        text = re.sub(r"/\*.*?\*/", "", text, flags=re.DOTALL)
-        return text
-
-    # コメントを除去
-    content_no_comments = remove_jsonc_comments(content)
-
-    # JSONとしてパース
-    return json.loads(content_no_comments)
+    Notes:
+        パース結果は (絶対パス, 更新時刻) をキーにキャッシュする。
+        バッチ実行で同じ設定ファイルを実行ごとに読み直さないため。
+    """
+    abs_path = os.path.abspath(file_path)
+    return copy.deepcopy(_load_jsonc_cached(abs_path, os.path.getmtime(abs_path)))
 
 
 def load_detectors() -> List[Detector]:
@@ -1,10 +1,11 @@
 """検出ログCSV出力モジュール"""
 
 import csv
+from operator import attrgetter
 from pathlib import Path
 from typing import List
 from ..domain.detection_record import DetectionRecord
-from .utils import format_timestamp
+from ...shared.utils.datetime_utils import format_timestamps
 
 
 def write_detector_logs(
@@ -50,7 +51,7 @@ def write_detector_logs(
         file_path = output_path / f"{detector_id}_log.csv"
 
         # タイムスタンプでソート
-        detector_records.sort(key=lambda r: r.timestamp)
+        detector_records.sort(key=attrgetter("timestamp"))
 
         with open(file_path, "w", newline="", encoding="utf-8") as f:
             writer = csv.writer(f)
@@ -66,14 +67,17 @@ def write_detector_logs(
                 ]
             )
 
-            # データ
-            for record in detector_records:
-                writer.writerow(
-                    [
-                        format_timestamp(record.timestamp),
-                        record.walker_id,
-                        record.hashed_id,
-                        record.detector_id,
-                        record.sequence_number,
-                    ]
+            # データ（タイムスタンプは検出器ごとにまとめて文字列化する）
+            ts_strs = format_timestamps(
+                [record.timestamp for record in detector_records]
+            )
+            writer.writerows(
+                (
+                    ts_str,
+                    record.walker_id,
+                    record.hashed_id,
+                    record.detector_id,
+                    record.sequence_number,
                 )
+                for record, ts_str in zip(detector_records, ts_strs)
+            )
@@ -4,6 +4,7 @@
 """
 
 import random
+from operator import attrgetter
 from datetime import timedelta
 from typing import List
 from ..domain.walker import Walker
@@ -135,7 +136,7 @@ def generate_detection_records(
                 )
 
         # タイムスタンプでソート
-        stay_records.sort(key=lambda r: r.timestamp)
+        stay_records.sort(key=attrgetter("timestamp"))
         records.extend(stay_records)
 
     return records
@@ -5,23 +5,30 @@
 
 import random
 from typing import List
+import numpy as np
 from ..domain.walker import Walker
 from ..domain.payload_config import PayloadDefinitionsDict
 from ...shared.domain.detector import Detector
 
 
-def generate_random_route(detectors: List[Detector]) -> str:
-    """ランダムなルート文字列を生成
+def generate_random_routes(
+    detectors: List[Detector], num_routes: int, rng: np.random.Generator
+) -> List[str]:
+    """ランダムなルート文字列をまとめて生成
+
+    乱数行列の行ごとの argsort で全ルート分の順列を一度に求める。
 
     Args:
         detectors: 検出器のリスト
+        num_routes: 生成するルートの数
+        rng: NumPy の乱数生成器
 
     Returns:
-        ルート文字列 (例: "ACBD")
+        ルート文字列のリスト (例: ["ACBD", "DBCA"])
     """
-    detector_ids = [d.id for d in detectors]
-    random.shuffle(detector_ids)
-    return "".join(detector_ids)
+    detector_ids = np.array([d.id for d in detectors])
+    permutations = np.argsort(rng.random((num_routes, detector_ids.size)), axis=1)
+    return ["".join(route) for route in detector_ids[permutations].tolist()]
 
 
 def generate_walkers(
@@ -43,6 +50,11 @@ def generate_walkers(
     Returns:
         通行人のリスト
     """
+    # ルートの順列は random モジュールの状態から導出した乱数生成器で一括生成
+    # （random.seed による再現性を維持する）
+    rng = np.random.default_rng(random.getrandbits(64))
+    routes = generate_random_routes(detectors, num_walkers, rng)
+
     walkers = []
     for i in range(num_walkers):
         walker_id = f"Walker_{i + 1}"
@@ -56,7 +68,7 @@ def generate_walkers(
             Walker(
                 id=walker_id,
                 model=assigned_model,
-                route=generate_random_route(detectors),
+                route=routes[i],
             )
         )
 
@@ -1,6 +1,13 @@
 """日時処理ユーティリティ"""
 
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import List, Sequence
+
+import numpy as np
+
+# エポック（マイクロ秒変換の基準）
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
 
 
 def format_timestamp(dt: datetime) -> str:
@@ -21,6 +28,29 @@ def format_timestamp(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
 
 
+def format_timestamps(timestamps: Sequence[datetime]) -> List[str]:
+    """タイムスタンプ列をまとめてミリ秒まで出力 (YYYY-MM-DD HH:MM:SS.mmm)
+
+    format_timestamp と同じ書式（ミリ秒未満は切り捨て）。
+    datetime64 配列に変換し、全件を NumPy で一括して文字列化する。
+
+    Args:
+        timestamps: datetime オブジェクトの列
+
+    Returns:
+        フォーマットされたタイムスタンプ文字列のリスト
+
+    Examples:
+        >>> from datetime import datetime
+        >>> format_timestamps([datetime(2024, 1, 14, 11, 0, 5, 123456)])
+        ['2024-01-14 11:00:05.123']
+    """
+    ts_arr = np.array(timestamps, dtype="datetime64[us]")
+    return np.char.replace(
+        np.datetime_as_string(ts_arr, unit="ms"), "T", " "
+    ).tolist()
+
+
 def parse_timestamp(ts_str: str) -> datetime:
     """タイムスタンプ文字列をパース
 
@@ -42,3 +72,22 @@ def parse_timestamp(ts_str: str) -> datetime:
     except ValueError:
         # ミリ秒なしのフォーマット
         return datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
+
+
+def to_epoch_microseconds(dt: datetime) -> int:
+    """タイムスタンプを 1970-01-01 からのマイクロ秒（整数）に変換
+
+    2つの値の差を 1e6 で割ると、timedelta.total_seconds() と同じ値になる。
+
+    Args:
+        dt: datetime オブジェクト（タイムゾーンなし）
+
+    Returns:
+        エポックからのマイクロ秒
+
+    Examples:
+        >>> from datetime import datetime
+        >>> to_epoch_microseconds(datetime(1970, 1, 1, 0, 0, 1, 500))
+        1000500
+    """
+    return (dt - _EPOCH) // _ONE_MICROSECOND